@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Снять фикстуру PING_STATUS_SYSROOT с текущей машины
+
+Копирует файлы ядра, которые читают ядро ping-status и плагины, в
+каталог с той же структурой, и сохраняет statvfs реальных точек
+монтирования в statvfs.json. Запуск из корня репозитория:
+
+    python3 bench/capture_fixture.py bench/fixtures/<имя>
+
+Перед коммитом фикстуры проверьте ее: в ней имя хоста, boot_id и
+точки монтирования этой машины.
+"""
+
+import argparse
+import glob
+import importlib.machinery
+import importlib.util
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+CORE_PATH = Path(__file__).resolve().parent.parent / 'ping-status'
+
+# Файлы, которые читаются напрямую
+KERNEL_FILES = [
+    '/proc/meminfo',
+    '/proc/stat',
+    '/proc/loadavg',
+    '/proc/uptime',
+    '/proc/diskstats',
+    '/proc/net/dev',
+    '/proc/net/route',
+    '/proc/self/mountinfo',
+    '/proc/sys/kernel/random/boot_id',
+    '/proc/sys/kernel/hostname',
+    '/proc/sys/kernel/osrelease',
+    '/etc/os-release'
+]
+
+# Файлы sysfs, которые плагины находят обходом каталогов
+KERNEL_GLOBS = [
+    '/sys/class/power_supply/*/uevent',
+    '/sys/class/hwmon/hwmon*/name',
+    '/sys/class/hwmon/hwmon*/temp*_input',
+    '/sys/class/hwmon/hwmon*/temp*_label',
+    '/sys/class/thermal/thermal_zone*/type',
+    '/sys/class/thermal/thermal_zone*/temp'
+]
+
+def load_core():
+    """Загрузить ping-status как модуль без PING_STATUS_SYSROOT"""
+    os.environ.pop('PING_STATUS_SYSROOT', None)
+    loader = importlib.machinery.SourceFileLoader('ping_status', str(CORE_PATH))
+    spec = importlib.util.spec_from_loader('ping_status', loader)
+    core = importlib.util.module_from_spec(spec)
+    sys.modules['ping_status'] = core
+    loader.exec_module(core)
+    return core
+
+def copy_file(source, root):
+    """Скопировать содержимое файла ядра (размер в /proc всегда 0, copy не подходит)"""
+    try:
+        with open(source, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return False
+    target = root / source.lstrip('/')
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(content)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Снять фикстуру файлов ядра')
+    parser.add_argument('target', help='Каталог фикстуры')
+    parser.add_argument('--force', action='store_true', help='Перезаписать существующий каталог')
+    args = parser.parse_args()
+
+    root = Path(args.target)
+    if root.exists():
+        if not args.force:
+            parser.error(f"{root} уже существует (--force, чтобы перезаписать)")
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    paths = list(KERNEL_FILES)
+    for pattern in KERNEL_GLOBS:
+        # Ссылки /sys/class раскрываются в копии как обычные каталоги
+        paths.extend(sorted(glob.glob(pattern)))
+    copied = sum(copy_file(path, root) for path in paths)
+
+    core = load_core()
+    statvfs = {}
+    for mount in [{'mount_point': '/'}] + core.get_block_mounts():
+        try:
+            statvfs[mount['mount_point']] = list(os.statvfs(mount['mount_point']))
+        except OSError:
+            continue
+    (root / 'statvfs.json').write_text(json.dumps(statvfs, indent=1) + '\n')
+
+    print(f"{root}: {copied} файлов, statvfs для {len(statvfs)} точек монтирования")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Бенчмарк register() плагинов на фикстурах файлов ядра
+
+Каждая фикстура из bench/fixtures (laptop, server, termux) подставляется
+как PING_STATUS_SYSROOT, поэтому плагины читают одни и те же /proc и /sys
+на любой машине и в CI. Запуск из корня репозитория:
+
+    python3 bench/plugin_bench.py [--fixture laptop] [--plugin disk-usage] [--runs 50]
+
+Каждый запуск - отдельная отрисовка (новый снимок procfs). Первый запуск
+на фикстуре (пустой кеш, поиск датчиков) показан отдельно. Сетевые
+плагины пропускаются, фоновые обновления swr_get() не запускаются.
+--save сохраняет медианы в JSON, --baseline сравнивает с сохраненными и
+завершается с кодом 1, если медиана выросла больше чем в --tolerance раз.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+CORE_PATH = BENCH_DIR.parent / 'ping-status'
+PLUGINS_DIR = BENCH_DIR.parent / 'plugins'
+FIXTURES_DIR = BENCH_DIR / 'fixtures'
+
+def load_core(home):
+    """Загрузить ping-status как модуль с HOME во временном каталоге"""
+    os.environ['HOME'] = home
+    loader = importlib.machinery.SourceFileLoader('ping_status', str(CORE_PATH))
+    spec = importlib.util.spec_from_loader('ping_status', loader)
+    core = importlib.util.module_from_spec(spec)
+    sys.modules['ping_status'] = core
+    loader.exec_module(core)
+    return core
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def reset_core(core):
+    """Состояние ядра как у нового процесса на новой машине"""
+    shutil.rmtree(core.CACHE_DIR, ignore_errors=True)
+    core.get_hostname.cache_clear()
+    core._boot_facts = None
+    core._background_refreshes.clear()
+    # Обновления копятся в очереди и не запускаются: меряем только отрисовку
+    core._pending_refreshes = []
+
+def run_once(core, register, plugin_file):
+    """Одна отрисовка плагина: (мс, процессы, результат)"""
+    core.new_snapshot()
+    state = core.new_source_state({'file': plugin_file})
+    try:
+        data = core.run_source(register, state)
+    except Exception as e:
+        data = e
+    return state['wall'] * 1000, state['processes'], data
+
+def bench_fixture(core, fixture, plugin_files, runs, show):
+    """Замеры всех плагинов на одной фикстуре: {плагин: результаты}"""
+    os.environ[core.SYSROOT_ENV] = str(fixture)
+    results = {}
+    for plugin_file in plugin_files:
+        reset_core(core)
+        with redirect_stdout(io.StringIO()):
+            module = core.import_plugin(plugin_file)
+        if module is None:
+            continue
+        register = core.get_register(module)
+
+        cold, processes, data = run_once(core, register, plugin_file)
+        samples = []
+        for _ in range(runs):
+            wall, processes, data = run_once(core, register, plugin_file)
+            samples.append(wall)
+
+        name = core.get_source_name(plugin_file)
+        results[name] = {
+            'cold': cold,
+            'median': statistics.median(samples),
+            'p95': percentile(samples, 0.95),
+            'processes': processes,
+            'error': None if isinstance(data, dict) else repr(data)
+        }
+        if show:
+            print(f"  {name}: {data}")
+    return results
+
+def main():
+    fixtures = sorted(path.name for path in FIXTURES_DIR.iterdir() if path.is_dir())
+    parser = argparse.ArgumentParser(description='Бенчмарк плагинов на фикстурах /proc и /sys')
+    parser.add_argument('--fixture', action='append', choices=fixtures,
+                        help='Фикстура (можно несколько, по умолчанию все)')
+    parser.add_argument('--plugin', action='append', help='Плагин (можно несколько, по умолчанию все не сетевые)')
+    parser.add_argument('--runs', type=int, default=50, help='Повторов на плагин')
+    parser.add_argument('--show', action='store_true', help='Показать результат register()')
+    parser.add_argument('--save', metavar='FILE', help='Сохранить медианы в JSON')
+    parser.add_argument('--baseline', metavar='FILE', help='Сравнить с сохраненными медианами')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='Допустимый рост медианы относительно --baseline (раз)')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory() as home:
+        core = load_core(home)
+        plugin_files = []
+        for plugin_file in sorted(PLUGINS_DIR.glob('*.py')):
+            name = core.get_source_name(plugin_file)
+            if args.plugin:
+                if name in args.plugin:
+                    plugin_files.append(plugin_file)
+            elif core.get_plugin_metadata(plugin_file)['cost'] != 'network':
+                plugin_files.append(plugin_file)
+
+        # git-status и другие плагины текущего каталога видят пустой каталог
+        os.chdir(home)
+        report = {}
+        regressed = False
+        for fixture in args.fixture or fixtures:
+            print(f"{fixture}:")
+            results = bench_fixture(core, FIXTURES_DIR / fixture, plugin_files, args.runs, args.show)
+            report[fixture] = {name: result['median'] for name, result in results.items()}
+            for name, result in results.items():
+                line = (f"  {name:<16} первый {result['cold']:7.3f} мс, median {result['median']:7.3f} мс, "
+                        f"p95 {result['p95']:7.3f} мс, процессов {result['processes']}")
+                previous = baseline.get(fixture, {}).get(name)
+                if previous:
+                    ratio = result['median'] / previous
+                    status = 'ok' if ratio <= args.tolerance else 'REGRESSION'
+                    regressed |= status != 'ok'
+                    line += f" [x{ratio:.2f} к baseline, {status}]"
+                if result['error']:
+                    line += f" ошибка: {result['error']}"
+                print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+    return 1 if regressed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
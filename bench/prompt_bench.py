@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Бенчмарк `ping-status --prompt` и `--read-snapshot`
+
+Быстрые пути выполняются на каждый Enter в оболочке и должны укладываться
+в бюджет целиком, от запуска процесса до вывода. Запуск из корня
+репозитория:
+
+    python3 bench/prompt_bench.py [--budget 10] [--runs 200] [--process-runs 100]
+
+Процессы `ping-status --prompt` и `--read-snapshot` запускаются так же,
+как из оболочки. Ядро они не компилируют, а для --version его байткод
+берется из кеша (PYTHONDONTWRITEBYTECODE снимается). Перед каждым запуском меряется пустой интерпретатор
+(`python3 -c pass`), и его время, от ping-status не зависящее,
+вычитается. Код выхода 1, если p95 остатка превысил бюджет для любого
+быстрого пути. Время тех же функций внутри процесса и команды,
+загружающей ядро (--version), выводится для сравнения.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+CORE_PATH = Path(__file__).resolve().parent.parent / 'ping-status'
+TEMPLATE = '{ping}ms {user}@{hostname} {git_branch} {disk} {cpu_bar} {weather}'
+
+# Значения, похожие на настоящие: с ANSI-цветами и символами для экранирования
+SAMPLE_DATA = {
+    'ping': '23.4',
+    'git_branch': '\x1b[35mfeature/$prompt\x1b[0m',
+    'disk': '\x1b[32m💾 19%\x1b[0m',
+    'cpu_bar': '████░░░░░░░░░░░░░░░░',
+    'weather': '☀️ +21°C 50%'
+}
+
+def load_core(home):
+    """Загрузить ping-status как модуль с HOME во временном каталоге"""
+    os.environ['HOME'] = home
+    loader = importlib.machinery.SourceFileLoader('ping_status', str(CORE_PATH))
+    spec = importlib.util.spec_from_loader('ping_status', loader)
+    core = importlib.util.module_from_spec(spec)
+    sys.modules['ping_status'] = core
+    loader.exec_module(core)
+    return core
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def bench_in_process(core, shell, runs):
+    """Время show_prompt() в миллисекундах, кеш всегда свежий"""
+    cache_path = core.get_prompt_cache_path()
+    samples = []
+    for _ in range(runs):
+        os.utime(cache_path)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            core.show_prompt(TEMPLATE, shell)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def bench_snapshot(core, runs):
+    """Время show_snapshot() в миллисекундах, снимок всегда свежий"""
+    samples = []
+    for _ in range(runs):
+        core.publish_snapshot('\n'.join(SAMPLE_DATA.values()), SAMPLE_DATA)
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            core.show_snapshot()
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(name, samples, budget=None):
+    """Вывести median/p95, вернуть True, если бюджет превышен"""
+    p95 = percentile(samples, 0.95)
+    line = f"{name}: median {statistics.median(samples):7.3f} мс, p95 {p95:7.3f} мс"
+    if budget is None:
+        print(line)
+        return False
+    status = 'ok' if p95 < budget else 'FAIL'
+    print(f"{line} [{status}, бюджет {budget:g} мс]")
+    return p95 >= budget
+
+def run_process(args, env):
+    """Время процесса от запуска до выхода в миллисекундах"""
+    start = time.perf_counter()
+    subprocess.run(args, env=env, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000
+
+def bench_process(args, env, runs, prepare=None):
+    """Время процесса без запуска интерпретатора, мс; prepare() перед каждым запуском
+
+    Пустой интерпретатор меряется непосредственно перед каждым запуском,
+    чтобы колебания нагрузки на машину попадали в обе части разности.
+    """
+    samples = []
+    for _ in range(runs):
+        startup = run_process([sys.executable, '-c', 'pass'], env)
+        if prepare:
+            prepare()
+        samples.append(run_process(args, env) - startup)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк ping-status --prompt')
+    parser.add_argument('--budget', type=float, default=10,
+                        help='Бюджет p95 процесса быстрого пути без запуска интерпретатора, мс')
+    parser.add_argument('--runs', type=int, default=200, help='Повторов в процессе')
+    parser.add_argument('--process-runs', type=int, default=100, help='Повторов запуска процесса')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ['XDG_RUNTIME_DIR'] = home
+        core = load_core(home)
+        config = core.load_config()
+        core.save_prompt_cache(config, dict(core.get_local_data(), **SAMPLE_DATA), {'git_branch': 'dir'})
+        cache_path = core.get_prompt_cache_path()
+        env = dict(os.environ, HOME=home)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+        print("внутри процесса:")
+        for shell in ('none', 'bash', 'zsh'):
+            report(f"  --prompt --shell {shell:4}", bench_in_process(core, shell, args.runs))
+        report("  --read-snapshot     ", bench_snapshot(core, args.runs))
+
+        # Первый запуск компилирует ядро в кеш байткода, дальше оно загружается готовым
+        run_process([sys.executable, str(CORE_PATH), '--version'], env)
+        startup = statistics.median(run_process([sys.executable, '-c', 'pass'], env) for _ in range(10))
+        print(f"процесс целиком без запуска интерпретатора ({startup:.1f} мс):")
+        failed = False
+        for shell in ('none', 'bash', 'zsh'):
+            samples = bench_process([sys.executable, str(CORE_PATH), '--prompt', TEMPLATE, '--shell', shell],
+                                    env, args.process_runs, lambda: os.utime(cache_path))
+            failed |= report(f"  --prompt --shell {shell:4}", samples, args.budget)
+        samples = bench_process([sys.executable, str(CORE_PATH), '--read-snapshot'], env, args.process_runs,
+                                lambda: core.publish_snapshot('\n'.join(SAMPLE_DATA.values()), SAMPLE_DATA))
+        failed |= report("  --read-snapshot     ", samples, args.budget)
+
+        samples = bench_process([sys.executable, str(CORE_PATH), '--version'], env, args.process_runs)
+        report("  --version (ядро)    ", samples)
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Пропускная способность установки и обновления на локальном репозитории
+
+Поднимает bench/repo_server.py и направляет на него ping-status через
+[plugin-repo] base_url во временном HOME, затем меряет список плагинов,
+установку всех плагинов по имени, проверку и загрузку обновлений,
+список и применение тем и проверку версии ядра. Запуск из корня
+репозитория:
+
+    python3 bench/repo_bench.py [--latency 50] [--jitter 20] [--fail-rate 0.1]
+
+perform_update() не выполняется: он пишет в /usr/local/bin и требует root.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from repo_server import start_server
+
+CORE_PATH = Path(__file__).resolve().parent.parent / 'ping-status'
+
+def load_core(home):
+    """Загрузить ping-status как модуль с HOME во временном каталоге"""
+    os.environ['HOME'] = home
+    loader = importlib.machinery.SourceFileLoader('ping_status', str(CORE_PATH))
+    spec = importlib.util.spec_from_loader('ping_status', loader)
+    core = importlib.util.module_from_spec(spec)
+    sys.modules['ping_status'] = core
+    loader.exec_module(core)
+    return core
+
+def write_config(home, base_url, timeout):
+    config_path = Path(home) / '.config' / 'ping-status.conf'
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_text(f"[plugin-repo]\nbase_url = {base_url}\ntimeout = {timeout}\nenabled = true\n")
+
+def measure(name, function, count, answers=''):
+    """Выполнить function() с ответами answers на input(), вывести время на операцию"""
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(answers)
+    try:
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+    finally:
+        sys.stdin = stdin
+    per_op = elapsed / count * 1000 if count else 0
+    rate = count / elapsed if elapsed else 0
+    print(f"{name:<28} {count:>3} оп. за {elapsed:6.3f} с: {per_op:8.1f} мс/оп, {rate:6.1f} оп/с")
+    return result
+
+def make_outdated(plugins_dir):
+    """Сбросить версии установленных плагинов, чтобы обновление нашло их все"""
+    for plugin_file in plugins_dir.glob('*.py'):
+        text = plugin_file.read_text(encoding='utf-8')
+        plugin_file.write_text(re.sub(r'__version__\s*=\s*[\'"][^\'"]*[\'"]',
+                                      '__version__ = "0.0.0"', text), encoding='utf-8')
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк установки и обновления на локальном репозитории')
+    parser.add_argument('--latency', type=float, default=0, help='Задержка ответа сервера, мс')
+    parser.add_argument('--jitter', type=float, default=0, help='Случайная добавка к задержке, мс')
+    parser.add_argument('--fail-rate', type=float, default=0, help='Доля ответов 503 (0..1)')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно задержек и отказов')
+    parser.add_argument('--timeout', type=int, default=10, help='[plugin-repo] timeout, с')
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                          fail_rate=args.fail_rate, seed=args.seed)
+    print(f"репозиторий {server.base_url}: задержка {args.latency:g}+{args.jitter:g} мс, "
+          f"отказы {args.fail_rate:.0%}")
+
+    with tempfile.TemporaryDirectory() as home:
+        write_config(home, server.base_url, args.timeout)
+        core = load_core(home)
+        plugins_dir = Path(home) / '.config' / 'ping-status' / 'plugins'
+
+        available = measure("список плагинов", core.get_available_plugins, 1)
+        installed = measure("установка по имени",
+                            lambda: sum(bool(core.install_plugin(name)) for name in sorted(available)),
+                            len(available))
+        count = len(list(plugins_dir.glob('*.py')))
+        measure("проверка: все актуальны", core.update_all_plugins, count)
+        make_outdated(plugins_dir)
+        measure("проверка и обновление всех", core.update_all_plugins, count, 'y\n' * count)
+        measure("проверка версии ядра", core.get_remote_version, 1)
+        themes = measure("список тем", core.get_available_themes, 1)
+
+        def apply_themes():
+            applied = 0
+            for name, url in sorted(themes.items()):
+                # Тема заменяет конфиг вместе с [plugin-repo]
+                write_config(home, server.base_url, args.timeout)
+                applied += bool(core.apply_theme_from_url(url, name))
+            return applied
+
+        applied = measure("применение тем", apply_themes, len(themes))
+
+    stats = server.stats
+    print(f"установлено плагинов {installed}/{len(available)}, применено тем {applied}/{len(themes)}")
+    print(f"сервер: запросов {stats['requests']}, отказов {stats['failures']}, "
+          f"{stats['bytes'] / 1024:.0f} КиБ")
+    server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Локальная замена репозитория ping-status для замеров без сети
+
+Отдает файлы репозитория (ping-status, ping_status.conf, plugins/,
+theme/) как raw.githubusercontent.com, а по /contents/<каталог> - список
+файлов в формате GitHub contents API. Задержка и доля отказов (HTTP 503)
+настраиваются, генератор случайных чисел фиксирован для повторяемости.
+
+    python3 bench/repo_server.py [--port 8765] [--latency 50] [--fail-rate 0.1]
+
+и в конфиге:
+
+    [plugin-repo]
+    base_url = http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Что из репозитория доступно серверу: файлы и каталоги со списком файлов
+SERVED_FILES = {'ping-status', 'ping_status.conf', 'install.sh'}
+SERVED_DIRS = {'plugins', 'theme'}
+
+class RepoServer(ThreadingHTTPServer):
+    """HTTP-сервер репозитория со счетчиками запросов
+
+    latency - задержка ответа в секундах (плюс до jitter секунд сверху),
+    fail_rate - доля запросов, которые получают 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, root=REPO_ROOT, latency=0.0, jitter=0.0, fail_rate=0.0, seed=0):
+        super().__init__(address, RepoRequestHandler)
+        self.root = Path(root)
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'failures': 0, 'bytes': 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self):
+        """(задержка, отказ) для очередного запроса"""
+        with self.lock:
+            delay = self.latency + self.random.random() * self.jitter
+            failed = self.random.random() < self.fail_rate
+            self.stats['requests'] += 1
+            self.stats['failures'] += failed
+        return delay, failed
+
+    def count_bytes(self, size):
+        with self.lock:
+            self.stats['bytes'] += size
+
+class RepoRequestHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        delay, failed = self.server.draw()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self.send_error(503, "Injected failure")
+            return
+
+        path = unquote(urlsplit(self.path).path).strip('/')
+        if path.startswith('contents/'):
+            body = self.list_directory(path[len('contents/'):])
+            content_type = 'application/json'
+        else:
+            body = self.read_file(path)
+            content_type = 'text/plain; charset=utf-8'
+        if body is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count_bytes(len(body))
+
+    def read_file(self, path):
+        top = path.split('/', 1)[0]
+        if path not in SERVED_FILES and top not in SERVED_DIRS:
+            return None
+        file_path = (self.server.root / path).resolve()
+        # '..' в пути не выводит за пределы репозитория
+        if self.server.root.resolve() not in file_path.parents or not file_path.is_file():
+            return None
+        return file_path.read_bytes()
+
+    def list_directory(self, path):
+        if path not in SERVED_DIRS:
+            return None
+        items = []
+        for file_path in sorted((self.server.root / path).iterdir()):
+            if not file_path.is_file():
+                continue
+            items.append({
+                'name': file_path.name,
+                'path': f"{path}/{file_path.name}",
+                'type': 'file',
+                'size': file_path.stat().st_size,
+                'download_url': f"{self.server.base_url}/{path}/{file_path.name}"
+            })
+        return json.dumps(items).encode('utf-8')
+
+def start_server(port=0, **options):
+    """Запустить сервер в фоновом потоке, вернуть RepoServer (base_url, stats)"""
+    server = RepoServer(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальный репозиторий ping-status')
+    parser.add_argument('--port', type=int, default=8765, help='Порт (0 - любой свободный)')
+    parser.add_argument('--root', default=str(REPO_ROOT), help='Каталог репозитория')
+    parser.add_argument('--latency', type=float, default=0, help='Задержка ответа, мс')
+    parser.add_argument('--jitter', type=float, default=0, help='Случайная добавка к задержке, мс')
+    parser.add_argument('--fail-rate', type=float, default=0, help='Доля ответов 503 (0..1)')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно генератора задержек и отказов')
+    args = parser.parse_args()
+
+    server = RepoServer(('127.0.0.1', args.port), root=args.root, latency=args.latency / 1000,
+                        jitter=args.jitter / 1000, fail_rate=args.fail_rate, seed=args.seed)
+    print(f"base_url = {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Нагрузочная проверка seqlock снимка статуса (--read-snapshot)
+
+Писатели без пауз публикуют снимки через publish_snapshot(), читатели
+без пауз читают их read_snapshot() - тем же кодом,
+что и `ping-status --read-snapshot`. Каждый снимок проверяет себя сам:
+вывод - символ, повторенный n раз, а символ и n лежат в данных. Размер
+меняется от записи к записи, поэтому файл растет и переотображается.
+Затем читатели встречают первую публикацию: файл уже создан, но пуст.
+Запуск из корня репозитория:
+
+    python3 bench/snapshot_stress.py [--duration 3] [--writers 2] [--readers 2] [--first-rounds 100]
+
+Код выхода 1, если хоть одно чтение вернуло несогласованный снимок или
+не дождалось первой публикации. Чтения под нагрузкой, которые не
+дождались конца записи (ValueError), считаются отдельно: это отказ, а не
+порча.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CORE_PATH = Path(__file__).resolve().parent.parent / 'ping-status'
+
+def load_core(home):
+    """Загрузить ping-status как модуль с HOME и XDG_RUNTIME_DIR во временном каталоге"""
+    os.environ['HOME'] = home
+    os.environ['XDG_RUNTIME_DIR'] = home
+    loader = importlib.machinery.SourceFileLoader('ping_status', str(CORE_PATH))
+    spec = importlib.util.spec_from_loader('ping_status', loader)
+    core = importlib.util.module_from_spec(spec)
+    sys.modules['ping_status'] = core
+    loader.exec_module(core)
+    return core
+
+def writer(core, index, deadline, results):
+    writes = 0
+    while time.time() < deadline:
+        char = 'ABCDEFGH'[(index * 3 + writes) % 8]
+        size = 100 + (writes * 7919 + index * 104729) % 20000
+        core.publish_snapshot(char * size, {'char': char, 'size': size, 'writer': index})
+        writes += 1
+    results.put(('writes', writes, 0, 0))
+
+def reader(core, deadline, results):
+    reads = torn = failed = 0
+    while time.time() < deadline:
+        try:
+            _, output, data = core.read_snapshot()
+        except ValueError:
+            failed += 1
+            continue
+        reads += 1
+        try:
+            data = json.loads(data)
+        except ValueError:
+            # Данные оборваны посередине записи
+            torn += 1
+            continue
+        if output != data['char'] * data['size']:
+            torn += 1
+    results.put(('reads', reads, torn, failed))
+
+def first_reader(core, results):
+    try:
+        results.put(core.read_snapshot()[1])
+    except ValueError as e:
+        results.put(str(e))
+
+def first_publish(core, rounds, readers):
+    """Читатели против первой публикации в пустой файл, вернуть число неверных чтений"""
+    path = core.get_snapshot_path()
+    context = multiprocessing.get_context('fork')
+    wrong = 0
+    for _ in range(rounds):
+        # Файл создан писателем, но еще не расширен и без заголовка
+        os.unlink(path)
+        open(path, 'wb').close()
+        results = context.Queue()
+        processes = [context.Process(target=first_reader, args=(core, results))
+                     for _ in range(readers)]
+        for process in processes:
+            process.start()
+        core.publish_snapshot('first', {})
+        for _ in processes:
+            if results.get(timeout=30) != 'first':
+                wrong += 1
+        for process in processes:
+            process.join()
+    return wrong
+
+def main():
+    parser = argparse.ArgumentParser(description='Нагрузочная проверка снимка статуса')
+    parser.add_argument('--duration', type=float, default=3, help='Длительность, с')
+    parser.add_argument('--writers', type=int, default=2, help='Процессов-писателей')
+    parser.add_argument('--readers', type=int, default=2, help='Процессов-читателей')
+    parser.add_argument('--first-rounds', type=int, default=100, help='Повторов первой публикации')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        core = load_core(home)
+        core.publish_snapshot('', {'char': '', 'size': 0})
+        # fork: дочерние процессы получают уже загруженное ядро
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        deadline = time.time() + args.duration
+        processes = [context.Process(target=writer, args=(core, i, deadline, results))
+                     for i in range(args.writers)]
+        processes += [context.Process(target=reader, args=(core, deadline, results))
+                      for _ in range(args.readers)]
+        for process in processes:
+            process.start()
+
+        totals = {'writes': 0, 'reads': 0, 'torn': 0, 'failed': 0}
+        for _ in processes:
+            # Упавший процесс не пришлет итог: не ждать его вечно
+            kind, count, torn, failed = results.get(timeout=args.duration + 30)
+            totals[kind] += count
+            totals['torn'] += torn
+            totals['failed'] += failed
+        for process in processes:
+            process.join()
+        size = os.path.getsize(core.get_snapshot_path())
+        first_wrong = first_publish(core, args.first_rounds, args.readers)
+
+    print(f"{args.duration:g} с: записей {totals['writes']}, чтений {totals['reads']}, "
+          f"несогласованных {totals['torn']}, не дождались записи {totals['failed']}, "
+          f"файл {size / 1024:.0f} КиБ")
+    print(f"первая публикация: повторов {args.first_rounds}, "
+          f"неверных чтений {first_wrong} из {args.first_rounds * args.readers}")
+    return 1 if totals['torn'] or first_wrong else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
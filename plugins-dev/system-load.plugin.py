@@ -2,17 +2,20 @@
 # Метаданные плагина
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins-dev/system-load.plugin.py"
 __name__ = "system-load"
-__last_updated__ = "2025-11-25 18:16:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.2.2"
+__min_version__ = "3.4.0"
+__provides__ = ["system_load", "load_avg", "cpu_cores", "memory_usage", "swap_usage", "temperature"]
+__cost__ = "io"
 
 import os
-import psutil
-import multiprocessing
+import glob
+from pathlib import Path
+import ping_status
 
 def get_help():
     return """
-System Load Plugin v1.0.0
+System Load Plugin v1.2.2
 =========================
 
 Показывает загрузку системы и температуру (если доступно).
@@ -34,21 +37,63 @@ show_temperature = true
 show_swap = true
 """
 
-def get_temperature():
-    """Получить температуру CPU"""
+# hwmon-драйверы датчиков CPU: у Intel/AMD берется максимум по всем
+# датчикам, у Raspberry Pi - первый
+CPU_HWMON_MAX = ['coretemp', 'k10temp']
+CPU_HWMON_FIRST = ['cpu_thermal']
+
+# Типы thermal zone с температурой CPU, если hwmon не нашлось
+CPU_THERMAL_ZONE_TYPES = ['x86_pkg_temp', 'cpu-thermal', 'cpu_thermal', 'soc_thermal']
+
+def read_text(path):
+    """Прочитать короткий файл sysfs"""
     try:
-        if hasattr(psutil, "sensors_temperatures"):
-            temps = psutil.sensors_temperatures()
-            if 'coretemp' in temps:
-                # Для Intel CPU
-                return max([temp.current for temp in temps['coretemp']])
-            elif 'cpu_thermal' in temps:
-                # Для Raspberry Pi
-                return temps['cpu_thermal'][0].current
-        return None
-    except:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
         return None
 
+def find_temperature_sensors():
+    """Файлы датчиков температуры CPU (обход hwmon и thermal zone)"""
+    hwmons = {}
+    for hwmon in sorted(glob.glob(ping_status.sys_path('/sys/class/hwmon/hwmon*'))):
+        name = read_text(os.path.join(hwmon, 'name'))
+        if name in CPU_HWMON_MAX + CPU_HWMON_FIRST and name not in hwmons:
+            hwmons[name] = sorted(glob.glob(os.path.join(hwmon, 'temp*_input')))
+
+    for name in CPU_HWMON_MAX:
+        if hwmons.get(name):
+            return hwmons[name]
+    for name in CPU_HWMON_FIRST:
+        if hwmons.get(name):
+            return hwmons[name][:1]
+
+    zones = {}
+    for zone in sorted(glob.glob(ping_status.sys_path('/sys/class/thermal/thermal_zone*'))):
+        zone_type = read_text(os.path.join(zone, 'type'))
+        if zone_type in CPU_THERMAL_ZONE_TYPES and zone_type not in zones:
+            zones[zone_type] = os.path.join(zone, 'temp')
+    for zone_type in CPU_THERMAL_ZONE_TYPES:
+        if zone_type in zones:
+            return [zones[zone_type]]
+    return []
+
+def get_temperature():
+    """Получить температуру CPU из sysfs (°C)
+
+    Датчики ищутся один раз за загрузку и читаются через sys_path, поэтому
+    на фикстуре PING_STATUS_SYSROOT температура тоже берется из нее.
+    """
+    paths = ping_status.boot_fact('system_load_temp_sensors', find_temperature_sensors)
+    temps = []
+    for path in paths or []:
+        value = read_text(path)
+        try:
+            temps.append(int(value) / 1000)
+        except (TypeError, ValueError):
+            pass
+    return max(temps) if temps else None
+
 def get_plugin_config():
     """Получить конфигурацию плагина"""
     from configparser import ConfigParser
@@ -71,18 +116,22 @@ def register():
         config = get_plugin_config()
         
         # Загрузка CPU
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        load_avg = os.getloadavg()
+        snapshot = ping_status.snapshot()
+        cpu_percent = ping_status.get_cpu_usage()['total'] or 0
+        load_avg = snapshot.loadavg or os.getloadavg()
         
-        # Память
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        memory_used_gb = memory.used / (1024**3)
-        memory_total_gb = memory.total / (1024**3)
+        # Память (значения /proc/meminfo в kB)
+        meminfo = snapshot.meminfo
+        memory_total = meminfo['MemTotal']
+        memory_used = memory_total - meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+        memory_percent = memory_used / memory_total * 100
+        memory_used_gb = memory_used / (1024**2)
+        memory_total_gb = memory_total / (1024**2)
         
         # Swap
-        swap = psutil.swap_memory()
-        swap_percent = swap.percent
+        swap_total = meminfo.get('SwapTotal', 0)
+        swap_used = swap_total - meminfo.get('SwapFree', 0)
+        swap_percent = swap_used / swap_total * 100 if swap_total > 0 else 0
         
         # Температура
         temp = get_temperature()
@@ -102,17 +151,17 @@ def register():
             
         parts.append(f"💾 RAM: {memory_str}")
         
-        if config['show_swap'] and swap.total > 0:
+        if config['show_swap'] and swap_total > 0:
             parts.append(f"💿 Swap: {swap_percent:.0f}%")
         
-        cpu_cores = multiprocessing.cpu_count()
+        cpu_cores = len([name for name in snapshot.stat['cpus'] if name != 'cpu']) or os.cpu_count()
         
         return {
             'system_load': " | ".join(parts),
             'load_avg': load_avg_str,
             'cpu_cores': str(cpu_cores),
             'memory_usage': f"{memory_percent:.0f}%",
-            'swap_usage': f"{swap_percent:.0f}%" if swap.total > 0 else "N/A",
+            'swap_usage': f"{swap_percent:.0f}%" if swap_total > 0 else "N/A",
             'temperature': f"{temp:.0f}°C" if temp else "N/A"
         }
         
@@ -2,16 +2,21 @@
 # Метаданные плагина для автоматического обновления
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/battery-status.plugin.py"
 __name__ = "battery-status"
-__last_updated__ = "2025-11-23 23:37:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.1.2"
+__min_version__ = "3.4.0"
+__provides__ = ["battery", "battery_level", "battery_status", "battery_icon", "battery_time"]
+__cost__ = "io"
 
 import os
+import math
+import time
 from pathlib import Path
+import ping_status
 
 def get_help():
     return """
-Battery Status Plugin v1.0.0
+Battery Status Plugin v1.1.2
 ============================
 
 Показывает состояние батареи ноутбука.
@@ -21,7 +26,7 @@ Available Placeholders:
 {battery_level}   - Только уровень заряда в процентах
 {battery_status}  - Только статус (Charging/Discharging/Full)
 {battery_icon}    - Только иконка состояния
-{battery_time}    - Оставшееся время (только для разрядки)
+{battery_time}    - Оставшееся время до разрядки или полного заряда
 
 Configuration:
 Add to ~/.config/ping-status.conf:
@@ -33,6 +38,9 @@ show_time = true
 # Использовать цветовые индикаторы (true/false)  
 use_colors = true
 
+# Время сглаживания оценки времени в секундах (по умолчанию: 60)
+smoothing = 60
+
 # Custom icons (optional)
 icon_charging = 🔌
 icon_discharging = 🔋  
@@ -42,61 +50,188 @@ icon_unknown = ❓
 Features:
 - Определяет уровень заряда и статус
 - Цветовые индикаторы для критического уровня
-- Показывает оставшееся время работы
+- Показывает оставшееся время работы (по энергии и мощности)
+- Несколько батарей суммируются по энергии
 - Простой и легковесный
 """
 
-def get_battery_info():
-    """Получить информацию о батарее"""
-    battery_path = Path("/sys/class/power_supply/")
-    
-    if not battery_path.exists():
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+# Оценка мощности по изменению энергии не чаще этого интервала (секунды)
+MIN_ENERGY_INTERVAL = 10
+
+def read_uevent(supply_dir):
+    """Прочитать uevent источника питания одним чтением
+
+    Возвращает словарь {'type': 'Battery', 'capacity': '80', ...}
+    с ключами без префикса POWER_SUPPLY_ в нижнем регистре.
+    """
+    values = {}
+    try:
+        with open(os.path.join(supply_dir, 'uevent'), 'r') as f:
+            content = f.read()
+    except OSError:
+        return values
+    for line in content.splitlines():
+        key, _, value = line.partition('=')
+        if key.startswith('POWER_SUPPLY_'):
+            values[key[len('POWER_SUPPLY_'):].lower()] = value.strip()
+    return values
+
+def read_int(values, key):
+    """Целое значение из uevent или None"""
+    try:
+        return int(values[key])
+    except (KeyError, ValueError):
         return None
-    
-    # Ищем батареи (BAT0, BAT1, etc)
-    batteries = list(battery_path.glob("BAT*"))
+
+def get_battery_energy(values):
+    """(energy_now, energy_full, power) в мкВт·ч и мкВт
+
+    Часть батарей отдает заряд (charge_*, мкА·ч) и ток (current_now, мкА),
+    тогда энергия считается через напряжение.
+    """
+    energy_now = read_int(values, 'energy_now')
+    energy_full = read_int(values, 'energy_full')
+    power = read_int(values, 'power_now')
+
+    voltage = read_int(values, 'voltage_min_design') or read_int(values, 'voltage_now')
+    if energy_now is None and voltage:
+        charge_now = read_int(values, 'charge_now')
+        charge_full = read_int(values, 'charge_full')
+        if charge_now is not None:
+            energy_now = charge_now * voltage // 1_000_000
+        if charge_full is not None:
+            energy_full = charge_full * voltage // 1_000_000
+    if power is None:
+        current = read_int(values, 'current_now')
+        voltage_now = read_int(values, 'voltage_now')
+        if current is not None and voltage_now:
+            power = current * voltage_now // 1_000_000
+
+    # Некоторые драйверы отдают отрицательный ток при разрядке
+    return energy_now, energy_full, abs(power) if power is not None else None
+
+def read_batteries():
+    """uevent всех батарей системы (периферийные устройства пропускаются)"""
+    batteries = []
+    power_supply_dir = ping_status.sys_path(POWER_SUPPLY_DIR)
+    try:
+        entries = sorted(os.listdir(power_supply_dir))
+    except OSError:
+        return batteries
+    for name in entries:
+        values = read_uevent(os.path.join(power_supply_dir, name))
+        if values.get('type') != 'Battery':
+            continue
+        # scope=Device - батарея мыши или наушников, а не ноутбука
+        if values.get('scope') == 'Device' or values.get('present') == '0':
+            continue
+        batteries.append(values)
+    return batteries
+
+def aggregate_status(statuses):
+    """Общий статус нескольких батарей"""
+    for status in ('Charging', 'Discharging'):
+        if status in statuses:
+            return status
+    if statuses and all(status == 'Full' for status in statuses):
+        return 'Full'
+    return statuses[0] if statuses else 'Unknown'
+
+def smooth_power(status, energy, power, smoothing=60):
+    """Сгладить мощность между запусками (EWMA с историей в кеше)
+
+    Если драйвер не отдает power_now, мощность оценивается по изменению
+    энергии с прошлого замера. При смене статуса история сбрасывается.
+    """
+    state_file = ping_status.get_cache_dir() / 'battery.json'
+    state = ping_status.read_json(state_file, {})
+    if not isinstance(state, dict) or state.get('status') != status:
+        state = {}
+    now = time.time()
+    elapsed = now - state.get('timestamp', now)
+    previous_power = state.get('power')
+
+    if power is None and state.get('energy') is not None and energy is not None:
+        delta = abs(energy - state['energy'])
+        if elapsed >= MIN_ENERGY_INTERVAL and delta > 0:
+            # мкВт·ч за elapsed секунд -> мкВт
+            power = delta * 3600 / elapsed
+
+    if power is None:
+        # Нового замера нет: точку отсчета энергии не двигаем
+        if not state:
+            state = {'timestamp': now, 'status': status, 'energy': energy, 'power': None}
+            try:
+                ping_status.write_json_atomic(state_file, state)
+            except OSError:
+                pass
+        return previous_power
+
+    if previous_power is not None and smoothing > 0 and elapsed > 0:
+        alpha = 1 - math.exp(-elapsed / smoothing)
+        power = previous_power + alpha * (power - previous_power)
+
+    try:
+        ping_status.write_json_atomic(state_file, {
+            'timestamp': now, 'status': status, 'energy': energy, 'power': power
+        })
+    except OSError:
+        pass
+    return power
+
+def format_duration(hours):
+    """Часы -> "2h05m" """
+    minutes = int(round(hours * 60))
+    return f"{minutes // 60}h{minutes % 60:02d}m"
+
+def get_battery_info(smoothing=60):
+    """Получить информацию о батарее (все батареи вместе)"""
+    batteries = read_batteries()
     if not batteries:
         return None
-    
-    # Берем первую найденную батарею
-    battery = batteries[0]
-    
-    try:
-        # Читаем уровень заряда
-        capacity_file = battery / "capacity"
-        if capacity_file.exists():
-            with open(capacity_file, 'r') as f:
-                capacity = int(f.read().strip())
+
+    statuses = [battery.get('status', 'Unknown') for battery in batteries]
+    status = aggregate_status(statuses)
+
+    energy_now = energy_full = power = 0
+    has_energy = has_power = True
+    for battery in batteries:
+        now, full, battery_power = get_battery_energy(battery)
+        if now is None or not full:
+            has_energy = False
         else:
-            return None
-        
-        # Читаем статус
-        status_file = battery / "status"
-        if status_file.exists():
-            with open(status_file, 'r') as f:
-                status = f.read().strip()
+            energy_now += now
+            energy_full += full
+        if battery_power is None:
+            has_power = False
         else:
-            status = "Unknown"
-        
-        # Читаем оставшееся время (если доступно)
-        time_file = battery / "time_to_empty"
-        time_remaining = None
-        if time_file.exists():
-            with open(time_file, 'r') as f:
-                time_minutes = int(f.read().strip())
-                if time_minutes > 0:
-                    hours = time_minutes // 60
-                    minutes = time_minutes % 60
-                    time_remaining = f"{hours}h{minutes}m"
-        
-        return {
-            'capacity': capacity,
-            'status': status,
-            'time_remaining': time_remaining
-        }
-        
-    except Exception:
-        return None
+            power += battery_power
+
+    if has_energy and energy_full:
+        # Уровень по энергии: батареи разной емкости весят по-разному
+        capacity = min(100, round(100 * energy_now / energy_full))
+    else:
+        levels = [read_int(battery, 'capacity') for battery in batteries]
+        levels = [level for level in levels if level is not None]
+        if not levels:
+            return None
+        capacity = round(sum(levels) / len(levels))
+
+    time_remaining = None
+    if has_energy and status in ('Charging', 'Discharging'):
+        power = smooth_power(status, energy_now, power if has_power and power > 0 else None, smoothing)
+        if power:
+            remaining = energy_now if status == 'Discharging' else energy_full - energy_now
+            if remaining > 0:
+                time_remaining = format_duration(remaining / power)
+
+    return {
+        'capacity': capacity,
+        'status': status,
+        'time_remaining': time_remaining
+    }
 
 def get_battery_config():
     """Получить конфигурацию плагина"""
@@ -112,6 +247,7 @@ def get_battery_config():
     return {
         'show_time': config.getboolean('battery', 'show_time', fallback=True),
         'use_colors': config.getboolean('battery', 'use_colors', fallback=True),
+        'smoothing': config.getfloat('battery', 'smoothing', fallback=60),
         'icon_charging': config.get('battery', 'icon_charging', fallback='🔌'),
         'icon_discharging': config.get('battery', 'icon_discharging', fallback='🔋'),
         'icon_full': config.get('battery', 'icon_full', fallback='✅'),
@@ -142,8 +278,8 @@ def colorize_battery_level(text, capacity):
 
 def register():
     """Функция регистрации плагина"""
-    battery_info = get_battery_info()
     config = get_battery_config()
+    battery_info = get_battery_info(config['smoothing'])
     
     if not battery_info:
         return {
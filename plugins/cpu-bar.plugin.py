@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 
-import psutil
-__min_version__ = "3.3.0"
+import ping_status
+__min_version__ = "3.4.0"
+__provides__ = ["cpu_bar"]
+__cost__ = "cheap"
+__ttl__ = 1
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/cpu-bar.plugin.py"
-__version__ = "1.0.3"
-__name__ == "cpu-bar"
+__version__ = "1.1.2"
+__name__ = "cpu-bar"
 def get_help():
     return """
 CPU Bar Plugin
@@ -14,6 +17,8 @@ Shows CPU usage as a progress bar.
 
 Available Placeholders:
 {cpu_bar} - CPU usage bar (20 characters)
+
+Uses the shared core CPU sampler: no blocking measurement interval.
 """
 
 def create_bar(percentage, width=20):
@@ -22,7 +27,7 @@ def create_bar(percentage, width=20):
     return bar
 
 def register():
-    cpu_percent = psutil.cpu_percent(interval=0.1)
+    cpu_percent = ping_status.get_cpu_usage()['total'] or 0
     return {
         'cpu_bar': create_bar(cpu_percent)
     }
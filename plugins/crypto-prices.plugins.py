@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
-__min_version__ = "3.3.0"
-__version__ = "1.0.1"
+import ping_status
+
+__min_version__ = "3.4.0"
+__provides__ = ["crypto_btc", "crypto_eth", "crypto_sol", "crypto_doge", "crypto_ada", "crypto_dot", "crypto_prices"]
+__cost__ = "network"
+__version__ = "1.2.1"
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/crypto-prices.plugins.py"
 __name__ = "crypto-prices"
 def get_help():
@@ -33,51 +37,47 @@ show_change = true
 # Символы для роста/падения
 up_symbol = 🟢
 down_symbol = 🔴
+# Как часто обновлять цены (секунды)
+ttl = 300
+# Пауза перед повторным запросом после ошибки API (секунды)
+error_ttl = 60
 
 Пример использования в шаблоне:
 {crypto_btc} - покажет: "₿ $45,231.50 🟢+2.3%"
 {crypto_prices} - покажет таблицу с ценами
+
+Цены всех монет запрашиваются одним запросом и обновляются в фоне
+раз в ttl секунд, отрисовка не ждет API.
+Маркер устаревшего значения задается в [cache] stale_marker.
 """
 
 def register():
-    import urllib.request
     import json
-    import time
     from pathlib import Path
     
-    def get_crypto_price(coin_id, currency='usd'):
-        """Получить цену криптовалюты с кешированием"""
-        cache_file = Path.home() / '.cache' / 'ping-status' / 'crypto_prices.json'
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Цены всех монет из одного запроса: {coin_id: {currency: ..., ...}}
+    prices = {}
+    
+    def get_all_prices(coin_ids, currency='usd', ttl=300, error_ttl=60):
+        """Получить цены всех монет одним запросом из кеша, обновляя его в фоне"""
+        ids = ",".join(sorted(set(coin_ids)))
+        if not ids:
+            return {}, False
         
-        # Проверяем кеш
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-                cache_time = cache_data.get('timestamp', 0)
-                if time.time() - cache_time < 300:  # 5 минут кеш
-                    return cache_data.get(coin_id, {})
-            except:
-                pass
+        def fetch():
+            # simple/price принимает список ids, все монеты - один запрос
+            url = f"https://api.coingecko.com/api/v3/simple/price?ids={ids}&vs_currencies={currency}&include_24hr_change=true"
+            data = json.loads(ping_status.http_get(url, timeout=10).decode('utf-8'))
+            if not isinstance(data, dict):
+                raise ValueError("unexpected API response")
+            return data
         
-        try:
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies={currency}&include_24hr_change=true"
-            
-            with urllib.request.urlopen(url, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                
-                # Сохраняем в кеш
-                cache_data = {'timestamp': time.time()}
-                cache_data.update(data)
-                with open(cache_file, 'w') as f:
-                    json.dump(cache_data, f)
-                
-                return data.get(coin_id, {})
-                
-        except Exception as e:
-            print(f"❌ Crypto API error: {e}")
-            return {}
+        return ping_status.swr_get(f"crypto-{currency}-{ids}", fetch, ttl,
+                                   default={}, error_ttl=error_ttl)
+    
+    def get_crypto_price(coin_id, currency='usd'):
+        """Получить цену криптовалюты из общего ответа"""
+        return prices.get(coin_id) or {}
     
     def get_plugin_config():
         """Получить конфигурацию плагина"""
@@ -95,7 +95,9 @@ def register():
             'currency': config.get('crypto', 'currency', fallback='usd'),
             'show_change': config.get('crypto', 'show_change', fallback='true').lower() == 'true',
             'up_symbol': config.get('crypto', 'up_symbol', fallback='🟢'),
-            'down_symbol': config.get('crypto', 'down_symbol', fallback='🔴')
+            'down_symbol': config.get('crypto', 'down_symbol', fallback='🔴'),
+            'ttl': config.getint('crypto', 'ttl', fallback=300),
+            'error_ttl': config.getint('crypto', 'error_ttl', fallback=60)
         }
         return crypto_config
     
@@ -191,12 +193,22 @@ def register():
         'dot': ('polkadot', '●')
     }
     
-    # Получаем данные для каждой криптовалюты
+    # Один запрос (и одна запись кеша) на все настроенные монеты
+    data, stale = get_all_prices(
+        [crypto_map[coin][0] for coin in config['coins'] if coin in crypto_map],
+        config['currency'],
+        config['ttl'],
+        config['error_ttl']
+    )
+    if isinstance(data, dict):
+        prices.update(data)
+    
+    # Форматируем каждую криптовалюту
     for coin in config['coins']:
         if coin in crypto_map:
             coin_id, symbol = crypto_map[coin]
             data = get_crypto_price(coin_id, config['currency'])
-            result[f'crypto_{coin}'] = format_crypto_display(
+            display = format_crypto_display(
                 data, 
                 symbol, 
                 config['currency'],
@@ -204,9 +216,10 @@ def register():
                 config['up_symbol'],
                 config['down_symbol']
             )
+            result[f'crypto_{coin}'] = ping_status.mark_stale(display, stale)
     
     # Сводная информация
-    result['crypto_prices'] = create_prices_table()
+    result['crypto_prices'] = ping_status.mark_stale(create_prices_table(), stale)
     
     # Заполняем отсутствующие значения
     for coin in ['btc', 'eth', 'sol', 'doge', 'ada', 'dot']:
@@ -1,17 +1,20 @@
 #!/usr/bin/env python3
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/disk-bar.plugin.py"
 __name__ = "disk-bar"
-__last_updated__ = "2025-11-25 23:31:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.2.1"
+__min_version__ = "3.4.0"
+__provides__ = ["disk_bar", "disk_bar_root", "disk_bar_home", "disk_bar_boot", "disk_bar_all"]
+__cost__ = "io"
+__ttl__ = 10
 
-import shutil
 import configparser
 from pathlib import Path
+import ping_status
 
 def get_help():
     return """
-Disk Bar Plugin v1.0.0
+Disk Bar Plugin v1.2.1
 ======================
 
 Shows disk usage as visual progress bars.
@@ -21,7 +24,7 @@ Available Placeholders:
 {disk_bar_root}   - Root partition bar  
 {disk_bar_home}   - Home partition bar
 {disk_bar_boot}   - Boot partition bar
-{disk_bar_all}    - All disks summary bar
+{disk_bar_all}    - All disks summary
 
 Configuration:
 Add to ~/.config/ping-status.conf:
@@ -54,12 +57,20 @@ filled_char = ■
 empty_char = □
 gradient_chars = ░▒▓█
 
+# Disks for {disk_bar_all}: auto (all block-device mounts from
+# /proc/self/mountinfo) or comma separated paths
+summary_mounts = auto
+
+# Seconds to wait for each mount before showing it as stale (default: 1)
+timeout = 1
+
 Features:
 - Multiple visual styles
 - Color-coded by usage level
 - Customizable bar length
 - Multiple partition support
 - Compact and informative
+- Hung NFS/FUSE mounts are shown as "stale" instead of freezing the prompt
 """
 
 def get_disk_bar_config():
@@ -84,19 +95,18 @@ def get_disk_bar_config():
         'threshold_high': config.getint('disk-bar', 'threshold_high', fallback=90),
         'filled_char': config.get('disk-bar', 'filled_char', fallback='■'),
         'empty_char': config.get('disk-bar', 'empty_char', fallback='□'),
-        'gradient_chars': config.get('disk-bar', 'gradient_chars', fallback='░▒▓█')
+        'gradient_chars': config.get('disk-bar', 'gradient_chars', fallback='░▒▓█'),
+        'summary_mounts': config.get('disk-bar', 'summary_mounts', fallback='auto'),
+        'timeout': config.getfloat('disk-bar', 'timeout', fallback=1)
     }
 
-def get_disk_usage(path):
-    """Get disk usage for path"""
-    try:
-        usage = shutil.disk_usage(path)
-        used_percent = (usage.used / usage.total) * 100
-        used_gb = usage.used / (1024**3)
-        total_gb = usage.total / (1024**3)
-        return used_percent, used_gb, total_gb
-    except Exception:
-        return None, None, None
+def get_summary_paths(config):
+    """Paths for the summary: configured list or auto-discovered block devices"""
+    if config['summary_mounts'].strip().lower() != 'auto':
+        return [p.strip() for p in config['summary_mounts'].split(',') if p.strip()]
+    paths = [mount['mount_point'] for mount in ping_status.get_block_mounts()]
+    # Containers often have no block devices, at least show the root
+    return paths or ['/']
 
 def get_usage_color(percent, config):
     """Get color based on usage percentage"""
@@ -107,18 +117,6 @@ def get_usage_color(percent, config):
     else:
         return config['color_low']
 
-def format_size(gb):
-    """Format size in GB to human readable"""
-    if gb is None:
-        return "N/A"
-    
-    if gb < 1:
-        return f"{gb*1024:.0f}MB"
-    elif gb < 10:
-        return f"{gb:.1f}GB"
-    else:
-        return f"{gb:.0f}GB"
-
 def create_bar(percent, config):
     """Create visual progress bar"""
     if percent is None:
@@ -178,11 +176,19 @@ def create_bar(percent, config):
 def create_disk_bar(path, label=None):
     """Create disk bar for specific path"""
     config = get_disk_bar_config()
-    percent, used_gb, total_gb = get_disk_usage(path)
+    usage = ping_status.get_disk_usage(path, config['timeout'])
     
-    if percent is None:
+    if usage is None:
         return "N/A"
     
+    if usage['stale']:
+        text = f"{label}: stale" if label else "stale"
+        return colorize_text(text, config['color_medium'])
+    
+    percent = usage['percent']
+    used = usage['used_h']
+    total = usage['total_h']
+    
     # Create the bar
     bar = create_bar(percent, config)
     
@@ -200,8 +206,8 @@ def create_disk_bar(path, label=None):
     if config['show_percentage']:
         parts.append(f"{percent:.0f}%")
     
-    if config['show_size'] and used_gb is not None and total_gb is not None:
-        parts.append(f"({format_size(used_gb)}/{format_size(total_gb)})")
+    if config['show_size'] and used is not None and total is not None:
+        parts.append(f"({used}/{total})")
     
     output = " ".join(parts)
     return colorize_text(output, color)
@@ -210,24 +216,28 @@ def create_summary_bar():
     """Create summary bar for all disks"""
     config = get_disk_bar_config()
     
-    # Check main partitions
-    partitions = [
-        ('/', 'root'),
-        (str(Path.home()), 'home'),
-        ('/boot', 'boot')
-    ]
+    paths = get_summary_paths(config)
+    usages = ping_status.get_disk_usages(paths, config['timeout'])
     
     critical_count = 0
+    stale_count = 0
     total_percent = 0
     valid_partitions = 0
     
-    for path, label in partitions:
-        percent, _, _ = get_disk_usage(path)
-        if percent is not None:
-            valid_partitions += 1
-            total_percent += percent
-            if percent >= config['threshold_high']:
-                critical_count += 1
+    for path in paths:
+        usage = usages[path]
+        if usage is None:
+            continue
+        if usage['stale']:
+            stale_count += 1
+            continue
+        valid_partitions += 1
+        total_percent += usage['percent']
+        if usage['percent'] >= config['threshold_high']:
+            critical_count += 1
+    
+    if valid_partitions == 0 and stale_count > 0:
+        return colorize_text(f"⏳ {stale_count} stale", config['color_medium'])
     
     if valid_partitions == 0:
         return colorize_text("No disks", 'red')
@@ -241,6 +251,9 @@ def create_summary_bar():
     elif avg_percent >= config['threshold_medium']:
         summary = "⚠️  high"
         color = config['color_medium']
+    elif stale_count > 0:
+        summary = f"⏳ {stale_count} stale"
+        color = config['color_medium']
     else:
         summary = "✓ ok"
         color = config['color_low']
@@ -265,6 +278,11 @@ def colorize_text(text, color):
 def register():
     """Plugin registration function"""
     try:
+        # All bars' paths are checked concurrently, each result is reused below
+        config = get_disk_bar_config()
+        paths = ['/', str(Path.home()), '/boot'] + get_summary_paths(config)
+        ping_status.get_disk_usages(paths, config['timeout'])
+        
         return {
             'disk_bar': create_disk_bar('/'),
             'disk_bar_root': create_disk_bar('/'),
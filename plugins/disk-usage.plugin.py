@@ -2,16 +2,20 @@
 # Метаданные плагина для автоматического обновления
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/disk-usage.plugin.py"
 __name__ = "disk-usage"
-__last_updated__ = "2025-11-23 23:32:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
-
-import shutil
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.2.1"
+__min_version__ = "3.4.0"
+__provides__ = ["disk", "disk_root", "disk_home", "disk_all"]
+__cost__ = "io"
+__ttl__ = 10
+
+import configparser
 from pathlib import Path
+import ping_status
 
 def get_help():
     return """
-Disk Usage Plugin v1.0.0
+Disk Usage Plugin v1.2.1
 ========================
 
 Shows disk usage in a compact, human-readable format.
@@ -38,11 +42,15 @@ show_emoji = true
 # Monitor specific paths (comma separated)
 paths = /,/home,/var
 
+# Seconds to wait for each mount before showing it as stale (default: 1)
+timeout = 1
+
 Features:
 - Color-coded by usage level (green/yellow/red)
 - Compact display perfect for status bars
 - Multiple partition monitoring
 - Threshold-based warnings
+- Hung NFS/FUSE mounts are shown as "stale" instead of freezing the prompt
 """
 
 def get_disk_config():
@@ -59,7 +67,8 @@ def get_disk_config():
         'warning_threshold': config.getint('disk-usage', 'warning_threshold', fallback=85),
         'critical_threshold': config.getint('disk-usage', 'critical_threshold', fallback=95),
         'show_emoji': config.getboolean('disk-usage', 'show_emoji', fallback=True),
-        'paths': [p.strip() for p in config.get('disk-usage', 'paths', fallback='/').split(',')]
+        'paths': [p.strip() for p in config.get('disk-usage', 'paths', fallback='/').split(',')],
+        'timeout': config.getfloat('disk-usage', 'timeout', fallback=1)
     }
 
 def get_disk_color(usage_percent, warning=85, critical=95):
@@ -71,16 +80,18 @@ def get_disk_color(usage_percent, warning=85, critical=95):
     else:
         return 'green'
 
-def format_disk_usage(path="/", show_emoji=True, warning=85, critical=95):
+def format_disk_usage(path="/", show_emoji=True, warning=85, critical=95, timeout=1):
     """Format disk usage for a specific path"""
     try:
-        usage = shutil.disk_usage(path)
-        used_percent = (usage.used / usage.total) * 100
-        used_gb = usage.used / (1024**3)
-        total_gb = usage.total / (1024**3)
+        usage = ping_status.get_disk_usage(path, timeout)
+        if usage is None:
+            return "💾 N/A", 'red'
+        emoji = "💾 " if show_emoji else ""
+        if usage['stale']:
+            return f"{emoji}stale", 'yellow'
+        used_percent = usage['percent']
         
         color = get_disk_color(used_percent, warning, critical)
-        emoji = "💾 " if show_emoji else ""
         
         # Compact format for status display
         if used_percent < 1:
@@ -104,25 +115,30 @@ def get_disk_summary():
             paths[0], 
             config['show_emoji'],
             config['warning_threshold'],
-            config['critical_threshold']
+            config['critical_threshold'],
+            config['timeout']
         )
         return usage, color
     else:
         # Multiple disks - show count of critical/warning disks
         critical_count = 0
         warning_count = 0
+        stale_count = 0
         
+        usages = ping_status.get_disk_usages(paths, config['timeout'])
         for path in paths:
-            try:
-                usage = shutil.disk_usage(path)
-                used_percent = (usage.used / usage.total) * 100
-                
-                if used_percent >= config['critical_threshold']:
-                    critical_count += 1
-                elif used_percent >= config['warning_threshold']:
-                    warning_count += 1
-            except:
+            usage = usages[path]
+            if usage is None:
                 continue
+            if usage['stale']:
+                stale_count += 1
+                continue
+            used_percent = usage['percent']
+            
+            if used_percent >= config['critical_threshold']:
+                critical_count += 1
+            elif used_percent >= config['warning_threshold']:
+                warning_count += 1
         
         emoji = "💾 " if config['show_emoji'] else ""
         
@@ -130,6 +146,8 @@ def get_disk_summary():
             return f"{emoji}{critical_count} crit", 'red'
         elif warning_count > 0:
             return f"{emoji}{warning_count} warn", 'yellow'
+        elif stale_count > 0:
+            return f"{emoji}{stale_count} stale", 'yellow'
         else:
             return f"{emoji}ok", 'green'
 
@@ -153,12 +171,16 @@ def register():
     try:
         config = get_disk_config()
         
+        # All paths are checked concurrently, each result is reused below
+        ping_status.get_disk_usages(config['paths'] + ['/', str(Path.home())], config['timeout'])
+        
         # Main disk usage (first path)
         main_usage, main_color = format_disk_usage(
             config['paths'][0],
             config['show_emoji'],
             config['warning_threshold'], 
-            config['critical_threshold']
+            config['critical_threshold'],
+            config['timeout']
         )
         
         # Root partition
@@ -166,7 +188,8 @@ def register():
             '/',
             config['show_emoji'],
             config['warning_threshold'],
-            config['critical_threshold']
+            config['critical_threshold'],
+            config['timeout']
         )
         
         # Home partition (if different from root)
@@ -174,7 +197,8 @@ def register():
             str(Path.home()),
             config['show_emoji'], 
             config['warning_threshold'],
-            config['critical_threshold']
+            config['critical_threshold'],
+            config['timeout']
         )
         
         # Summary of all disks
@@ -2,18 +2,24 @@
 # Метаданные плагина для автоматического обновления
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/git-status.plugin.py"
 __name__ = "git-status"
-__last_updated__ = "2025-11-24 10:01:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.3.1"
+__min_version__ = "3.4.0"
+__provides__ = ["git_status", "git_branch", "git_commits", "git_changes", "git_repo_name", "git_workspace"]
+__cost__ = "io"
 
 import os
+import re
+import time
 import subprocess
 import configparser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import ping_status
 
 def get_help():
     return """
-Git Status Plugin v1.0.0
+Git Status Plugin v1.3.1
 ========================
 
 Показывает статус Git репозиториев в текущей директории.
@@ -24,6 +30,7 @@ Placeholders:
 {git_commits}    - Количество коммитов для пуша/пулла
 {git_changes}    - Измененные файлы
 {git_repo_name}  - Название репозитория
+{git_workspace}  - Сводка по всем репозиториям workspace
 
 Configuration:
 Добавьте в конфиг:
@@ -32,8 +39,13 @@ Configuration:
 # Показывать подробную информацию (true/false)
 detailed = true
 
-# Максимальная глубина поиска репозиториев (уровни вложенности)
-max_depth = 3
+# Максимальная глубина поиска репозиториев вверх от текущей директории
+# (число уровней или unlimited - до корня или GIT_CEILING_DIRECTORIES)
+max_depth = unlimited
+
+# Сколько секунд доверять кешу статуса, пока index/HEAD/refs не менялись
+# (правки неиндексированных файлов видны не позже этого срока, 0 - без кеша)
+max_age = 30
 
 # Автоматически искать репозитории в родительских директориях
 auto_find = true
@@ -47,12 +59,34 @@ color_dirty = yellow
 color_unpushed = red
 color_no_repo = white
 
+# Каталог с репозиториями для {git_workspace} (пусто - выключено)
+workspace = ~/src
+# Глубина поиска репозиториев в workspace (~/src/org/repo - 2)
+workspace_depth = 2
+# Сколько git status запускать параллельно
+workspace_workers = 8
+# Сколько секунд доверять кешу репозиториев workspace
+workspace_max_age = 300
+# Сколько худших репозиториев показывать
+workspace_top = 3
+
 Примеры использования:
 {git_status} - "🌿 main ±2 🚀+1" (ветка, изменения, коммиты для пуша)
 {git_branch} - "main"
 {git_commits} - "🚀+1" (коммиты для пуша)
+{git_workspace} - "📂 42 ±5 🚀3 📥2 | api±12 web↑4 lib↓1"
 """
 
+def parse_max_depth(value):
+    """Глубина поиска: число уровней или None (unlimited)"""
+    value = value.strip().lower()
+    if value in ('', 'unlimited', 'none', '-1'):
+        return None
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return None
+
 def get_git_config():
     """Получить конфигурацию плагина"""
     config_path = Path.home() / '.config' / 'ping-status.conf'
@@ -65,37 +99,141 @@ def get_git_config():
     
     return {
         'detailed': config.getboolean('git-status', 'detailed', fallback=True),
-        'max_depth': config.getint('git-status', 'max_depth', fallback=3),
+        'max_depth': parse_max_depth(config.get('git-status', 'max_depth', fallback='unlimited')),
+        'max_age': config.getfloat('git-status', 'max_age', fallback=30),
         'auto_find': config.getboolean('git-status', 'auto_find', fallback=True),
         'show_icons': config.getboolean('git-status', 'show_icons', fallback=True),
         'color_clean': config.get('git-status', 'color_clean', fallback='green'),
         'color_dirty': config.get('git-status', 'color_dirty', fallback='yellow'),
         'color_unpushed': config.get('git-status', 'color_unpushed', fallback='red'),
-        'color_no_repo': config.get('git-status', 'color_no_repo', fallback='white')
+        'color_no_repo': config.get('git-status', 'color_no_repo', fallback='white'),
+        'workspace': config.get('git-status', 'workspace', fallback=''),
+        'workspace_depth': config.getint('git-status', 'workspace_depth', fallback=2),
+        'workspace_workers': config.getint('git-status', 'workspace_workers', fallback=8),
+        'workspace_max_age': config.getfloat('git-status', 'workspace_max_age', fallback=300),
+        'workspace_top': config.getint('git-status', 'workspace_top', fallback=3)
     }
 
-def find_git_repo():
-    """Найти Git репозиторий в текущей или родительских директориях"""
-    config = get_git_config()
-    current_path = Path.cwd()
-    max_depth = config['max_depth']
-    
-    for depth in range(max_depth + 1):
-        check_path = current_path
-        for _ in range(depth):
-            check_path = check_path.parent
-            
-        git_path = check_path / '.git'
-        if git_path.exists():
-            return check_path
-    
-    return None
+# Сколько каталогов помнить в кеше поиска репозиториев
+REPO_MEMO_LIMIT = 256
+
+def get_ceiling_dirs():
+    """Границы поиска из GIT_CEILING_DIRECTORIES (только абсолютные пути)"""
+    value = os.environ.get('GIT_CEILING_DIRECTORIES', '')
+    return {os.path.normpath(path) for path in value.split(os.pathsep)
+            if os.path.isabs(path)}
+
+def resolve_git_dir(dot_git):
+    """(git_dir, common_dir) для .git каталога или файла ссылки
+
+    Worktree и submodule хранят в .git файл "gitdir: <путь>"; у worktree в
+    git_dir есть еще commondir с путем к общему каталогу (refs, config).
+    """
+    if os.path.isdir(dot_git):
+        git_dir = dot_git
+    else:
+        content = read_git_file(os.path.dirname(dot_git), '.git') or ''
+        if not content.startswith('gitdir:'):
+            return None
+        git_dir = os.path.normpath(os.path.join(os.path.dirname(dot_git),
+                                                content[len('gitdir:'):].strip()))
+        if not os.path.exists(os.path.join(git_dir, 'HEAD')):
+            return None
+
+    commondir = read_git_file(git_dir, 'commondir')
+    if commondir:
+        common_dir = os.path.normpath(os.path.join(git_dir, commondir))
+    else:
+        common_dir = git_dir
+    return git_dir, common_dir
+
+def discover_git_repo(cwd, max_depth=None, ceilings=()):
+    """Подняться от cwd к корню (или границе) и найти репозиторий
+
+    Возвращает (repo, stamps): repo - {'path', 'git_dir', 'common_dir'} или
+    None, stamps - mtime пройденных каталогов. Появление или удаление .git
+    в любом из них меняет mtime каталога, поэтому по stamps можно проверить,
+    что результат еще верен.
+    """
+    stamps = {}
+    current = cwd
+    depth = 0
+    while True:
+        try:
+            stamps[current] = os.stat(current).st_mtime_ns
+        except OSError:
+            return None, stamps
+
+        dot_git = os.path.join(current, '.git')
+        if os.path.lexists(dot_git):
+            resolved = resolve_git_dir(dot_git)
+            if resolved:
+                if resolved[0] != dot_git:
+                    # Файл ссылки .git может быть перезаписан на месте
+                    stamps[dot_git] = os.stat(dot_git).st_mtime_ns
+                git_dir, common_dir = resolved
+                return {'path': current, 'git_dir': git_dir, 'common_dir': common_dir}, stamps
+
+        parent = os.path.dirname(current)
+        if (parent == current or parent in ceilings or
+                (max_depth is not None and depth >= max_depth)):
+            return None, stamps
+        current = parent
+        depth += 1
+
+def find_git_repo(config):
+    """Найти Git репозиторий в текущей или родительских директориях
+
+    Соответствие cwd -> репозиторий запоминается в git-repos.json и
+    проверяется по mtime пройденных каталогов, так что в глубоких
+    worktree повторный поиск стоит несколько stat.
+    """
+    try:
+        cwd = os.getcwd()
+    except OSError:
+        return None
+    max_depth = config['max_depth'] if config['auto_find'] else 0
+    ceilings = get_ceiling_dirs()
+    limits = [max_depth, sorted(ceilings)]
+
+    memo_file = ping_status.get_cache_dir() / 'git-repos.json'
+    memo = ping_status.read_json(memo_file, {})
+    if not isinstance(memo, dict):
+        memo = {}
+
+    entry = memo.get(cwd)
+    if isinstance(entry, dict) and entry.get('limits') == limits and isinstance(entry.get('stamps'), dict):
+        valid = True
+        for path, stamp in entry['stamps'].items():
+            try:
+                if os.stat(path).st_mtime_ns != stamp:
+                    valid = False
+                    break
+            except OSError:
+                valid = False
+                break
+        if valid:
+            return entry['repo']
+
+    repo, stamps = discover_git_repo(cwd, max_depth, ceilings)
+
+    memo.pop(cwd, None)
+    memo[cwd] = {'limits': limits, 'stamps': stamps, 'repo': repo}
+    while len(memo) > REPO_MEMO_LIMIT:
+        memo.pop(next(iter(memo)))
+    try:
+        ping_status.write_json_atomic(memo_file, memo)
+    except OSError:
+        pass
+    return repo
 
 def run_git_command(repo_path, command):
     """Выполнить Git команду и вернуть результат"""
     try:
         result = subprocess.run(
-            ['git'] + command,
+            # Без optional locks git status не переписывает index,
+            # иначе каждый запуск менял бы mtime и сбрасывал кеш
+            ['git', '--no-optional-locks'] + command,
             cwd=repo_path,
             capture_output=True,
             text=True,
@@ -107,46 +245,291 @@ def run_git_command(repo_path, command):
     except:
         return None
 
-def get_git_branch(repo_path):
-    """Получить текущую ветку"""
-    branch = run_git_command(repo_path, ['branch', '--show-current'])
+def read_git_file(git_dir, name):
+    """Прочитать служебный файл из .git"""
+    try:
+        with open(os.path.join(git_dir, name), 'r') as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def read_head(git_dir):
+    """Ветка из .git/HEAD или None для detached HEAD"""
+    head = read_git_file(git_dir, 'HEAD') or ''
+    if head.startswith('ref: refs/heads/'):
+        return head[len('ref: refs/heads/'):]
+    return None
+
+GIT_CONFIG_SECTION = re.compile(r'^\s*\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+GIT_CONFIG_VALUE = re.compile(r'^\s*([A-Za-z][A-Za-z0-9-]*)\s*(?:=\s*(.*?))?\s*$')
+
+def parse_git_config(text):
+    """Минимальный разбор git config: {'remote.origin': {'url': ...}}
+
+    Поддерживает секции с подсекциями, комментарии и кавычки в значениях;
+    include и продолжения строк не нужны для ветки и URL удаленного репозитория.
+    """
+    config = {}
+    section = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped[0] in '#;':
+            continue
+        match = GIT_CONFIG_SECTION.match(line)
+        if match:
+            name = match.group(1).lower()
+            if match.group(2) is not None:
+                name += '.' + re.sub(r'\\(.)', r'\1', match.group(2))
+            section = config.setdefault(name, {})
+            line = line[match.end():]
+            if not line.strip():
+                continue
+        match = GIT_CONFIG_VALUE.match(line)
+        if match and section is not None:
+            value = match.group(2)
+            if value is None:
+                value = 'true'
+            elif value.startswith('"') and value.endswith('"') and len(value) > 1:
+                value = value[1:-1]
+            else:
+                value = re.split(r'\s[#;]', value)[0].strip()
+            section[match.group(1).lower()] = value
+    return config
+
+def read_git_config(git_dir):
+    """Разобранный .git/config"""
+    return parse_git_config(read_git_file(git_dir, 'config') or '')
+
+def get_upstream_ref(git_config, branch):
+    """Файл ссылки upstream ветки относительно .git (refs/remotes/origin/main)"""
     if not branch:
-        # Попробуем другой способ
-        head_ref = run_git_command(repo_path, ['symbolic-ref', '--short', 'HEAD'])
-        return head_ref or "detached"
-    return branch
-
-def get_git_status(repo_path):
-    """Получить статус Git"""
-    status_output = run_git_command(repo_path, ['status', '--porcelain'])
-    return status_output
-
-def get_unpushed_commits(repo_path, branch):
-    """Получить количество неотправленных коммитов"""
-    if branch == "detached":
-        return 0
-    
-    # Коммиты для пуша
-    push_count = run_git_command(repo_path, ['rev-list', '--count', f'{branch}@{{u}}..{branch}'])
-    # Коммиты для пулла
-    pull_count = run_git_command(repo_path, ['rev-list', '--count', f'{branch}..{branch}@{{u}}'])
-    
-    return {
-        'push': int(push_count) if push_count else 0,
-        'pull': int(pull_count) if pull_count else 0
-    }
+        return None
+    branch_config = git_config.get(f'branch.{branch}', {})
+    remote = branch_config.get('remote')
+    merge = branch_config.get('merge', '')
+    if not remote or remote == '.' or not merge.startswith('refs/heads/'):
+        return None
+    return f"refs/remotes/{remote}/{merge[len('refs/heads/'):]}"
 
-def get_remote_url(repo_path):
-    """Получить URL удаленного репозитория"""
-    remote = run_git_command(repo_path, ['remote', 'get-url', 'origin'])
-    if remote:
-        # Извлекаем имя репозитория из URL
-        if '/' in remote:
-            repo_name = remote.split('/')[-1]
+def get_repo_name(git_config, repo_path):
+    """Имя репозитория из URL origin (или первого удаленного) либо имя каталога"""
+    remotes = [name for name in git_config if name.startswith('remote.')]
+    if 'remote.origin' in remotes:
+        remotes.insert(0, 'remote.origin')
+    for name in remotes:
+        remote = git_config[name].get('url')
+        if remote:
+            # Извлекаем имя репозитория из URL (https://.../name.git, git@host:name.git)
+            repo_name = re.split(r'[/:]', remote.rstrip('/'))[-1]
             if repo_name.endswith('.git'):
                 repo_name = repo_name[:-4]
-            return repo_name
-    return None
+            if repo_name:
+                return repo_name
+    return Path(repo_path).name
+
+def parse_porcelain_v2(output):
+    """Разобрать git status --porcelain=v2 --branch
+
+    Возвращает ветку, счетчики push/pull и список кодов изменений в стиле
+    porcelain v1 ('M', 'A', 'D', 'R', '?', ...).
+    """
+    result = {'branch': 'detached', 'push': 0, 'pull': 0, 'changes': []}
+    for line in output.splitlines():
+        if line.startswith('# branch.head '):
+            head = line[len('# branch.head '):]
+            if head != '(detached)':
+                result['branch'] = head
+        elif line.startswith('# branch.ab '):
+            for value in line.split()[2:]:
+                if value.startswith('+'):
+                    result['push'] = int(value[1:])
+                elif value.startswith('-'):
+                    result['pull'] = int(value[1:])
+        elif line.startswith(('1 ', '2 ', 'u ')):
+            # XY: '.' означает отсутствие изменений с этой стороны
+            code = line[2:4].replace('.', ' ').strip()
+            result['changes'].append(code[0] if code else 'M')
+        elif line.startswith('? '):
+            result['changes'].append('?')
+    return result
+
+def get_state_stamps(repo, branch, upstream_ref):
+    """mtime файлов .git, от которых зависит статус (None, если файла нет)
+
+    index и HEAD у каждого worktree свои, refs и config - в общем каталоге.
+    """
+    paths = [os.path.join(repo['git_dir'], 'index'),
+             os.path.join(repo['git_dir'], 'HEAD'),
+             os.path.join(repo['common_dir'], 'packed-refs'),
+             os.path.join(repo['common_dir'], 'config')]
+    if branch:
+        paths.append(os.path.join(repo['common_dir'], 'refs', 'heads', branch))
+    if upstream_ref:
+        paths.append(os.path.join(repo['common_dir'], upstream_ref))
+
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+def load_state_cache():
+    """Кеш статусов репозиториев из git-status.json"""
+    cache = ping_status.read_json(ping_status.get_cache_dir() / 'git-status.json', {})
+    return cache if isinstance(cache, dict) else {}
+
+def save_state_cache(cache):
+    """Сохранить кеш статусов репозиториев"""
+    try:
+        ping_status.write_json_atomic(ping_status.get_cache_dir() / 'git-status.json', cache)
+    except OSError:
+        pass
+
+def get_repo_state(repo, max_age=30, cache=None):
+    """Статус репозитория: ветка, push/pull, изменения, имя
+
+    Результат кешируется в git-status.json и считается актуальным, пока не
+    изменились index, HEAD, packed-refs, config и ссылки ветки/upstream.
+    Правки еще не добавленных в index файлов эти mtime не меняют, поэтому
+    запись дополнительно живет не дольше max_age секунд. Если cache
+    передан, он обновляется на месте, а сохраняет его вызывающий.
+    """
+    repo_path = repo['path']
+    key = repo_path
+    now = time.time()
+
+    save = cache is None
+    if save:
+        cache = load_state_cache()
+
+    entry = cache.get(key)
+    if (isinstance(entry, dict) and max_age > 0 and
+            0 <= now - entry.get('timestamp', 0) < max_age and
+            isinstance(entry.get('stamps'), dict) and
+            get_state_stamps(repo, entry.get('head'), entry.get('upstream_ref')) == entry['stamps']):
+        return entry['state']
+
+    output = run_git_command(repo_path, ['status', '--porcelain=v2', '--branch'])
+    state = parse_porcelain_v2(output or '')
+
+    git_config = read_git_config(repo['common_dir'])
+    head = read_head(repo['git_dir'])
+    upstream_ref = get_upstream_ref(git_config, head)
+    state['repo_name'] = get_repo_name(git_config, repo_path)
+    if output is None:
+        # git недоступен или завершился ошибкой: ветка из HEAD, без кеша
+        state['branch'] = head or 'detached'
+        return state
+
+    cache[key] = {
+        'timestamp': now,
+        'head': head,
+        'upstream_ref': upstream_ref,
+        'stamps': get_state_stamps(repo, head, upstream_ref),
+        'state': state
+    }
+    if save:
+        save_state_cache(cache)
+    return state
+
+def find_workspace_repos(root, depth=2):
+    """Репозитории в каталоге root не глубже depth уровней
+
+    В найденный репозиторий не спускаемся (submodule относятся к нему),
+    скрытые каталоги пропускаем.
+    """
+    repos = []
+    pending = [(root, 0)]
+    while pending:
+        directory, level = pending.pop()
+        dot_git = os.path.join(directory, '.git')
+        if level > 0 and os.path.lexists(dot_git):
+            resolved = resolve_git_dir(dot_git)
+            if resolved:
+                repos.append({'path': directory, 'git_dir': resolved[0], 'common_dir': resolved[1]})
+                continue
+        if level >= depth:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('.') and entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, level + 1))
+        except OSError:
+            continue
+    return sorted(repos, key=lambda repo: repo['path'])
+
+def scan_workspace(root, depth=2, workers=8, max_age=300):
+    """Статусы всех репозиториев workspace: [(имя, state)]
+
+    git status для репозиториев с устаревшим кешем запускается параллельно
+    в пуле из workers потоков; кеш сохраняется один раз после сканирования.
+    """
+    repos = find_workspace_repos(root, depth)
+    if not repos:
+        return []
+
+    cache = load_state_cache()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        states = list(executor.map(lambda repo: get_repo_state(repo, max_age, cache), repos))
+    save_state_cache(cache)
+
+    return [(os.path.relpath(repo['path'], root), state) for repo, state in zip(repos, states)]
+
+def format_workspace(results, config):
+    """Сводка workspace: "📂 42 ±5 🚀3 📥2 | api±12 web🚀4" """
+    if not results:
+        return ""
+
+    icons = config['show_icons']
+    dirty = sum(1 for _, state in results if state['changes'])
+    ahead = sum(1 for _, state in results if state['push'] > 0)
+    behind = sum(1 for _, state in results if state['pull'] > 0)
+
+    parts = []
+    if icons:
+        parts.append("📂")
+    parts.append(str(len(results)))
+    if dirty:
+        parts.append(f"±{dirty}")
+    if ahead:
+        parts.append(f"🚀{ahead}" if icons else f"↑{ahead}")
+    if behind:
+        parts.append(f"📥{behind}" if icons else f"↓{behind}")
+    summary = " ".join(parts)
+
+    # Худшие репозитории: больше всего изменений и расхождений с upstream
+    offenders = sorted(
+        (item for item in results if item[1]['changes'] or item[1]['push'] or item[1]['pull']),
+        key=lambda item: (-(len(item[1]['changes']) + item[1]['push'] + item[1]['pull']), item[0])
+    )[:config['workspace_top']]
+
+    details = []
+    for name, state in offenders:
+        text = name
+        if state['changes']:
+            text += f"±{len(state['changes'])}"
+        if state['push']:
+            text += f"↑{state['push']}"
+        if state['pull']:
+            text += f"↓{state['pull']}"
+        details.append(text)
+
+    if not details:
+        return colorize_text(summary, config['color_clean'])
+    color = config['color_unpushed'] if ahead else config['color_dirty']
+    return colorize_text(f"{summary} | {' '.join(details)}", color)
+
+def get_workspace_status(config):
+    """Значение {git_workspace} (пусто, если workspace не настроен)"""
+    if not config['workspace']:
+        return ""
+    root = os.path.expanduser(config['workspace'])
+    results = scan_workspace(root, config['workspace_depth'],
+                             config['workspace_workers'], config['workspace_max_age'])
+    return format_workspace(results, config)
 
 def colorize_text(text, color):
     """Цветовой вывод текста"""
@@ -163,9 +546,9 @@ def colorize_text(text, color):
     color_code = colors.get(color.lower(), '37')
     return f'\033[{color_code}m{text}\033[0m'
 
-def format_git_output(repo_path, config):
+def format_git_output(repo, config):
     """Форматировать вывод Git статуса"""
-    if not repo_path:
+    if not repo:
         no_repo_msg = "No Git repo"
         if config['show_icons']:
             no_repo_msg = "❌ " + no_repo_msg
@@ -177,13 +560,14 @@ def format_git_output(repo_path, config):
             'git_repo_name': ""
         }
     
-    branch = get_git_branch(repo_path)
-    status = get_git_status(repo_path)
-    unpushed = get_unpushed_commits(repo_path, branch)
-    repo_name = get_remote_url(repo_path) or repo_path.name
+    state = get_repo_state(repo, config['max_age'])
+    branch = state['branch']
+    changes = state['changes']
+    unpushed = {'push': state['push'], 'pull': state['pull']}
+    repo_name = state['repo_name']
     
     # Определяем статус
-    has_changes = bool(status)
+    has_changes = bool(changes)
     has_unpushed = unpushed['push'] > 0
     has_unpulled = unpushed['pull'] > 0
     
@@ -205,8 +589,7 @@ def format_git_output(repo_path, config):
     status_parts.append(branch)
     
     if has_changes:
-        change_count = len(status.split('\n'))
-        status_parts.append(f"±{change_count}")
+        status_parts.append(f"±{len(changes)}")
     
     commit_parts = []
     if unpushed['push'] > 0:
@@ -229,15 +612,11 @@ def format_git_output(repo_path, config):
     # Детальная информация
     if config['detailed']:
         changes_info = []
-        if status:
+        if changes:
             file_stats = {'M': 0, 'A': 0, 'D': 0, 'R': 0, '?': 0}
-            for line in status.split('\n'):
-                if line:
-                    status_code = line[:2].strip()
-                    if status_code:
-                        first_char = status_code[0]
-                        if first_char in file_stats:
-                            file_stats[first_char] += 1
+            for first_char in changes:
+                if first_char in file_stats:
+                    file_stats[first_char] += 1
             
             change_parts = []
             if file_stats['M'] > 0:
@@ -255,7 +634,7 @@ def format_git_output(repo_path, config):
         
         git_changes = changes_info
     else:
-        git_changes = "±" + str(len(status.split('\n'))) if status else "clean"
+        git_changes = "±" + str(len(changes)) if changes else "clean"
     
     # Коммиты для пуша/пулла
     commits_info = []
@@ -277,13 +656,16 @@ def register():
     """Функция регистрации плагина"""
     try:
         config = get_git_config()
-        repo_path = find_git_repo()
-        return format_git_output(repo_path, config)
+        repo = find_git_repo(config)
+        result = format_git_output(repo, config)
+        result['git_workspace'] = get_workspace_status(config)
+        return result
     except Exception as e:
         return {
             'git_status': f"Git error: {str(e)}",
             'git_branch': "error",
             'git_commits': "error",
             'git_changes': "error",
-            'git_repo_name': "error"
+            'git_repo_name': "error",
+            'git_workspace': "error"
         }
\ No newline at end of file
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 
-import psutil
-__min_version__ = "3.3.0"
+import ping_status
+__min_version__ = "3.4.0"
+__provides__ = ["memory_bar", "memory_percent"]
+__cost__ = "cheap"
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/memory-bar.plugin.py"
-__version__ = "1.0.1"
+__version__ = "1.1.1"
 __name__ = "memory-bar"
 def get_help():
     return """
@@ -22,9 +24,17 @@ def create_bar(percentage, width=20):
     bar = '█' * filled + '░' * (width - filled)
     return bar
 
+def get_memory_percent():
+    meminfo = ping_status.snapshot().meminfo
+    total = meminfo.get('MemTotal', 0)
+    if not total:
+        return 0.0
+    available = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+    return (total - available) / total * 100
+
 def register():
-    memory = psutil.virtual_memory()
+    percent = get_memory_percent()
     return {
-        'memory_bar': create_bar(memory.percent),
-        'memory_percent': f"{memory.percent:.1f}"
+        'memory_bar': create_bar(percent),
+        'memory_percent': f"{percent:.1f}"
     }
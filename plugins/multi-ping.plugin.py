@@ -2,19 +2,26 @@
 
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/multi-ping.plugin.py"
 __name__ = "multi-ping"
-__last_updated__ = "2025-11-23 23:00:00"
-__version__ = "1.2.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.4.1"
+__min_version__ = "3.4.0"
+__provides__ = ["mping", "mping_short", "mping_avg", "mping_status", "mping_up", "mping_down", "mping_total", "mping_worst", "mping_p50", "mping_p95", "mping_health"]
+__cost__ = "network"
+__ttl__ = 5
 
-import subprocess
+import asyncio
 import configparser
+import ipaddress
+import math
+import re
 from pathlib import Path
 import statistics
 import time
+import ping_status
 
 def get_help():
     return """
-Multi-Ping Plugin v1.2.0
+Multi-Ping Plugin v1.4.1
 ========================
 
 Pings multiple servers and displays results with average calculation.
@@ -24,18 +31,43 @@ Available Placeholders:
 {mping_short}    - Short version with average only  
 {mping_avg}      - Just the average ping value
 {mping_status}   - Status icons (✅/❌) for each server
+{mping_up}       - Number of reachable targets
+{mping_down}     - Number of unreachable targets
+{mping_total}    - Number of configured targets
+{mping_worst}    - Worst targets (offline first, then slowest)
+{mping_p50}      - Median round trip time
+{mping_p95}      - 95th percentile round trip time
+{mping_health}   - Aggregate summary: "✅ 287/300 p50 12ms p95 40ms"
 
 Configuration:
 Add to ~/.config/ping-status.conf:
 
 [multi-ping]
-# Servers to ping (supports up to 8 servers)
+# Servers to ping (server-N, any number of them)
 server-1 = 1.1.1.1
 server-2 = 8.8.8.8
 server-3 = google.com
 server-4 = github.com
 server-5 = archlinux.org
 
+# More targets: comma separated list and/or a file with one target per
+# line ("host [display name]", # for comments). CIDR ranges are expanded.
+servers = 10.0.0.0/28, 192.168.1.1
+servers_file = ~/.config/ping-status/hosts.txt
+
+# Max targets after CIDR expansion (default: 1024)
+max_targets = 1024
+
+# Max pings running at the same time (default: 32)
+concurrency = 32
+
+# Above this many targets {mping} and {mping_status} show the
+# aggregate summary instead of every host (default: 8)
+max_display = 8
+
+# How many hosts {mping_worst} lists (default: 3)
+worst_count = 3
+
 # Display names (optional, uses host if not set)
 name-1 = Cloudflare
 name-2 = Google DNS
@@ -63,6 +95,8 @@ Features:
 - Calculates average of successful pings  
 - Handles timeouts and unreachable servers
 - Multiple display formats
+- All servers and attempts are probed concurrently (worst case: one timeout)
+- Hundreds of targets with a concurrency cap and aggregate summaries
 - Caching for performance
 """
 
@@ -84,8 +118,15 @@ def get_multi_ping_config():
     servers = []
     display_names = {}
     
-    for i in range(1, 9):  # Support up to 8 servers
-        server = config.get('multi-ping', f'server-{i}', fallback='')
+    server_keys = []
+    if config.has_section('multi-ping'):
+        for key in config.options('multi-ping'):
+            match = re.fullmatch(r'server-(\d+)', key)
+            if match:
+                server_keys.append(int(match.group(1)))
+    
+    for i in sorted(server_keys):
+        server = config.get('multi-ping', f'server-{i}', fallback='').strip()
         if server:
             servers.append(server)
             # Get display name if specified
@@ -93,6 +134,17 @@ def get_multi_ping_config():
             if name:
                 display_names[server] = name
     
+    servers.extend(s.strip() for s in config.get('multi-ping', 'servers', fallback='').split(','))
+    
+    servers_file = config.get('multi-ping', 'servers_file', fallback='')
+    if servers_file:
+        file_servers, file_names = read_servers_file(Path(servers_file).expanduser())
+        servers.extend(file_servers)
+        display_names.update(file_names)
+    
+    max_targets = config.getint('multi-ping', 'max_targets', fallback=1024)
+    servers = expand_targets(servers, max_targets)
+    
     # Ping parameters
     attempts = config.getint('multi-ping', 'attempts', fallback=2)
     timeout = config.getint('multi-ping', 'timeout', fallback=1)
@@ -100,6 +152,9 @@ def get_multi_ping_config():
     # Display settings
     display_format = config.get('multi-ping', 'format', fallback='compact')
     show_offline = config.getboolean('multi-ping', 'show_offline', fallback=True)
+    concurrency = config.getint('multi-ping', 'concurrency', fallback=32)
+    max_display = config.getint('multi-ping', 'max_display', fallback=8)
+    worst_count = config.getint('multi-ping', 'worst_count', fallback=3)
     
     return {
         'colors': colors,
@@ -108,68 +163,123 @@ def get_multi_ping_config():
         'attempts': attempts,
         'timeout': timeout,
         'format': display_format,
-        'show_offline': show_offline
+        'show_offline': show_offline,
+        'concurrency': max(1, concurrency),
+        'max_display': max_display,
+        'worst_count': worst_count
     }
 
-def ping_server(host, attempts=2, timeout=1):
-    """Ping server with multiple attempts and caching"""
-    cache_file = Path.home() / '.cache' / 'ping-status' / 'multi-ping.json'
-    cache_file.parent.mkdir(parents=True, exist_ok=True)
+def read_servers_file(path):
+    """Read targets from a file: "host [display name]" per line"""
+    servers = []
+    display_names = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split(None, 1)
+                servers.append(parts[0])
+                if len(parts) > 1:
+                    display_names[parts[0]] = parts[1]
+    except OSError:
+        pass
+    return servers, display_names
+
+def expand_targets(targets, max_targets=1024):
+    """Expand CIDR ranges, drop duplicates and cap the number of targets"""
+    expanded = []
+    seen = set()
     
-    # Check cache (5 second cache for performance)
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
-            if host in cache_data:
-                cached_time = cache_data[host].get('timestamp', 0)
-                if time.time() - cached_time < 5:  # 5 second cache
-                    return cache_data[host].get('result')
-        except:
-            pass
+    for target in targets:
+        if not target:
+            continue
+        
+        hosts = [target]
+        if '/' in target:
+            try:
+                network = ipaddress.ip_network(target, strict=False)
+                # /32 and /128 have no "hosts" besides the address itself
+                hosts = (str(ip) for ip in (network.hosts() if network.num_addresses > 1 else network))
+            except ValueError:
+                pass
+        
+        for host in hosts:
+            if len(expanded) >= max_targets:
+                return expanded
+            if host not in seen:
+                seen.add(host)
+                expanded.append(host)
     
-    successful_pings = []
+    return expanded
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+# Cache lifetime of a ping result (seconds)
+CACHE_TTL = 5
+
+def get_cache_file():
+    """Path to the multi-ping cache file"""
+    return ping_status.get_cache_dir() / 'multi-ping.json'
+
+async def limited_ping(host, timeout, semaphore):
+    """Single ping that waits for a free concurrency slot"""
+    async with semaphore:
+        return await ping_status.async_ping(host, timeout)
+
+async def ping_server(host, attempts=2, timeout=1, semaphore=None):
+    """Ping server with all attempts running concurrently"""
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(attempts)
+    pings = await asyncio.gather(
+        *(limited_ping(host, timeout, semaphore) for _ in range(attempts))
+    )
+    successful_pings = [ping_ms for ping_ms in pings if ping_ms is not None]
+    return statistics.mean(successful_pings) if successful_pings else None
+
+async def ping_servers(servers, attempts=2, timeout=1, concurrency=32):
+    """Ping all servers concurrently; the cache is read and written once"""
+    cache_file = get_cache_file()
+    cache_data = ping_status.read_json(cache_file, {})
+    if not isinstance(cache_data, dict):
+        cache_data = {}
     
-    for attempt in range(attempts):
-        try:
-            result = subprocess.run(
-                ['ping', '-c', '1', '-W', str(timeout), host],
-                capture_output=True,
-                text=True,
-                timeout=timeout + 1
-            )
-            
-            if result.returncode == 0:
-                time_line = [line for line in result.stdout.split('\n') if 'time=' in line]
-                if time_line:
-                    ping_time = time_line[0].split('time=')[1].split(' ')[0]
-                    try:
-                        # Extract numeric value, handle different formats
-                        ping_ms = float(ping_time.replace(' ms', '').replace('ms', ''))
-                        successful_pings.append(ping_ms)
-                    except ValueError:
-                        continue
-        except (subprocess.TimeoutExpired, Exception):
-            continue
+    now = time.time()
+    results = {}
+    pending = []
     
-    result = statistics.mean(successful_pings) if successful_pings else None
+    for host in servers:
+        cached = cache_data.get(host)
+        if isinstance(cached, dict) and now - cached.get('timestamp', 0) < CACHE_TTL:
+            results[host] = cached.get('result')
+        else:
+            pending.append(host)
     
-    # Update cache
-    try:
-        cache_data = {}
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
-        cache_data[host] = {
-            'timestamp': time.time(),
-            'result': result
-        }
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f)
-    except:
-        pass
+    if pending:
+        semaphore = asyncio.Semaphore(concurrency)
+        fresh = await asyncio.gather(
+            *(ping_server(host, attempts, timeout, semaphore) for host in pending)
+        )
+        now = time.time()
+        for host, result in zip(pending, fresh):
+            results[host] = result
+            cache_data[host] = {
+                'timestamp': now,
+                'result': result
+            }
+        # Keep only configured targets so the cache does not grow forever
+        cache_data = {host: cache_data[host] for host in servers if host in cache_data}
+        try:
+            ping_status.write_json_atomic(cache_file, cache_data)
+        except OSError:
+            pass
     
-    return result
+    return results
 
 def colorize_text(text, color):
     """Colorize text using ANSI codes"""
@@ -186,7 +296,44 @@ def colorize_text(text, color):
     color_code = colors.get(color.lower(), '37')
     return f'\033[{color_code}m{text}\033[0m'
 
-def get_multi_ping_results():
+def get_summary(ping_results, servers, display_names, worst_count=3):
+    """Aggregate health of all targets without rendering every host"""
+    rtts = [ping_results[host] for host in servers if ping_results.get(host) is not None]
+    total = len(servers)
+    up = len(rtts)
+    
+    # Offline hosts first, then the slowest ones
+    ranked = sorted(
+        servers,
+        key=lambda host: (ping_results.get(host) is not None, -(ping_results.get(host) or 0))
+    )
+    worst = []
+    for host in ranked[:worst_count]:
+        name = display_names.get(host, host)
+        rtt = ping_results.get(host)
+        worst.append(f"{name}: {rtt:.0f}ms" if rtt is not None else f"{name}: timeout")
+    
+    p50 = f"{percentile(rtts, 50):.1f}ms" if rtts else "N/A"
+    p95 = f"{percentile(rtts, 95):.1f}ms" if rtts else "N/A"
+    
+    if total == 0:
+        health = colorize_text("No servers", 'red')
+    else:
+        icon = "✅" if up == total else ("⚠️" if up else "❌")
+        color = 'green' if up == total else ('yellow' if up else 'red')
+        health = colorize_text(f"{icon} {up}/{total} p50 {p50} p95 {p95}", color)
+    
+    return {
+        'up': str(up),
+        'down': str(total - up),
+        'total': str(total),
+        'worst': ", ".join(worst) if worst else "N/A",
+        'p50': p50,
+        'p95': p95,
+        'health': health
+    }
+
+async def get_multi_ping_results():
     """Get multi-ping results with formatting"""
     config = get_multi_ping_config()
     servers = config['servers']
@@ -202,7 +349,23 @@ def get_multi_ping_results():
             'detailed': colorize_text("No servers configured", 'red'),
             'short': colorize_text("No servers", 'red'),
             'average': colorize_text("N/A", 'red'),
-            'status': colorize_text("No config", 'red')
+            'status': colorize_text("No config", 'red'),
+            **get_summary({}, [], {}, config['worst_count'])
+        }
+    
+    ping_results = await ping_servers(servers, attempts, timeout, config['concurrency'])
+    summary = get_summary(ping_results, servers, display_names, config['worst_count'])
+    
+    # Too many targets to render one by one: show the aggregate instead
+    if len(servers) > config['max_display']:
+        successful_pings = [r for r in ping_results.values() if r is not None]
+        average = f"{statistics.mean(successful_pings):.1f}ms" if successful_pings else colorize_text("N/A", 'red')
+        return {
+            'detailed': summary['health'],
+            'short': f"{summary['up']}/{summary['total']} ok: {average}",
+            'average': average,
+            'status': summary['health'],
+            **summary
         }
     
     results = []
@@ -213,7 +376,7 @@ def get_multi_ping_results():
         color = colors[i % len(colors)]
         display_name = display_names.get(server, server)
         
-        ping_result = ping_server(server, attempts, timeout)
+        ping_result = ping_results.get(server)
         
         if ping_result is not None:
             # Successful ping
@@ -258,7 +421,8 @@ def get_multi_ping_results():
             'detailed': detailed_output,
             'short': short,
             'average': f"{avg_ping:.1f}ms",
-            'status': status_output
+            'status': status_output,
+            **summary
         }
     else:
         error_msg = colorize_text("All servers offline", 'red')
@@ -266,18 +430,26 @@ def get_multi_ping_results():
             'detailed': error_msg,
             'short': error_msg,
             'average': error_msg,
-            'status': "❌❌❌"
+            'status': "❌❌❌",
+            **summary
         }
 
-def register():
+async def register_async():
     """Plugin registration function"""
     try:
-        results = get_multi_ping_results()
+        results = await get_multi_ping_results()
         return {
             'mping': results['detailed'],
             'mping_short': results['short'],
             'mping_avg': results['average'],
-            'mping_status': results['status']
+            'mping_status': results['status'],
+            'mping_up': results['up'],
+            'mping_down': results['down'],
+            'mping_total': results['total'],
+            'mping_worst': results['worst'],
+            'mping_p50': results['p50'],
+            'mping_p95': results['p95'],
+            'mping_health': results['health']
         }
     except Exception as e:
         error_msg = f"Multi-ping error: {str(e)}"
@@ -285,5 +457,16 @@ def register():
             'mping': error_msg,
             'mping_short': error_msg,
             'mping_avg': "error",
-            'mping_status': "⚠️"
+            'mping_status': "⚠️",
+            'mping_up': "error",
+            'mping_down': "error",
+            'mping_total': "error",
+            'mping_worst': "error",
+            'mping_p50': "error",
+            'mping_p95': "error",
+            'mping_health': "⚠️"
         }
+
+def register():
+    """Synchronous entry point for callers without an event loop"""
+    return asyncio.run(register_async())
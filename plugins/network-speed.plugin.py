@@ -2,19 +2,20 @@
 
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/network-speed.plugin.py"
 __name__ = "network-speed"
-__last_updated__ = "2025-11-24 10:49:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.1.4"
+__min_version__ = "3.4.0"
+__provides__ = ["net_speed", "download_speed", "upload_speed", "network_usage", "network_interface"]
+__cost__ = "cheap"
 
-import psutil
+import math
 import time
-import threading
 from pathlib import Path
-import json
+import ping_status
 
 def get_help():
     return """
-Network Speed Plugin v1.0.0
+Network Speed Plugin v1.1.4
 ============================
 
 Показывает текущую скорость сети (загрузка/отдача) в реальном времени.
@@ -23,202 +24,204 @@ Placeholders:
 {net_speed}        - Текущая скорость загрузки и отдачи
 {download_speed}   - Скорость загрузки
 {upload_speed}     - Скорость отдачи
-{network_usage}    - Использование сети за сессию
+{network_usage}    - Трафик интерфейса с момента его поднятия
 {network_interface} - Активный сетевой интерфейс
 
 Configuration:
 Добавьте в конфиг:
 [network-speed]
-# Интервал обновления в секундах (по умолчанию: 2)
+# Время сглаживания скорости в секундах (по умолчанию: 2)
 interval = 2
-# Единицы измерения (mbps, kbps, B/s) 
+# Единицы измерения (mbps, kbps, B/s)
 units = mbps
 # Показывать иконки (true/false)
 show_icons = true
 # Интерфейс для мониторинга (auto для автоматического выбора)
 interface = auto
+
+Скорость считается по разнице счетчиков /proc/net/dev с предыдущим
+запуском (снимок хранится в кеше) и сглаживается EWMA, поэтому плагин
+не ждет и не запускает фоновых потоков. Первый запуск показывает 0.
 """
 
-class NetworkSpeedMonitor:
-    def __init__(self):
-        self.download_speed = 0
-        self.upload_speed = 0
-        self.total_download = 0
-        self.total_upload = 0
-        self.last_download = 0
-        self.last_upload = 0
-        self.last_time = time.time()
-        self.running = False
-        self.thread = None
-        self.interface = self.get_active_interface()
-        
-    def get_active_interface(self):
-        """Определить активный сетевой интерфейс"""
-        try:
-            stats = psutil.net_io_counters(pernic=True)
-            for interface, data in stats.items():
-                # Исключаем виртуальные и локальные интерфейсы
-                if (interface.startswith(('eth', 'wlan', 'en', 'wl', 'rmnet')) and 
-                    data.bytes_sent + data.bytes_recv > 0):
-                    return interface
-            return "lo"  # fallback на loopback
-        except:
-            return "unknown"
-    
-    def start_monitoring(self, interval=2):
-        """Запустить мониторинг сети в отдельном потоке"""
-        if self.running:
-            return
-            
-        self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, args=(interval,))
-        self.thread.daemon = True
-        self.thread.start()
-    
-    def stop_monitoring(self):
-        """Остановить мониторинг"""
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=1)
-    
-    def _monitor_loop(self, interval):
-        """Цикл мониторинга сети"""
-        # Начальные значения
+# Счетчики 32-битных ядер переполняются на этом значении
+COUNTER_WRAP_32 = 2 ** 32
+
+# Предельная скорость (байт/с, 1 Гбит/с), если скорость линка неизвестна:
+# уменьшение счетчика, для которого переполнение дало бы большую скорость,
+# считается сбросом интерфейса
+DEFAULT_MAX_RATE = 125_000_000
+
+# Запуски чаще этого интервала (секунды) не обновляют снимок
+MIN_SAMPLE_INTERVAL = 0.2
+
+def read_net_counters():
+    """Счетчики байт всех интерфейсов (/proc/net/dev из снимка ядра)"""
+    return ping_status.snapshot().net_dev
+
+def get_default_route_interface():
+    """Интерфейс маршрута по умолчанию из /proc/net/route"""
+    route = ping_status.get_default_route()
+    return route['interface'] if route else None
+
+def get_active_interface(counters, configured='auto'):
+    """Определить активный сетевой интерфейс"""
+    if configured != 'auto':
+        return configured
+
+    default_interface = get_default_route_interface()
+    if default_interface in counters:
+        return default_interface
+
+    for interface, data in counters.items():
+        # Исключаем виртуальные и локальные интерфейсы
+        if (interface.startswith(('eth', 'wlan', 'en', 'wl', 'rmnet')) and
+            data['rx'] + data['tx'] > 0):
+            return interface
+    return "lo" if "lo" in counters else "unknown"
+
+def get_link_rate(interface):
+    """Скорость линка в байтах в секунду из /sys/class/net, None - неизвестна"""
+    try:
+        with open(ping_status.sys_path(f'/sys/class/net/{interface}/speed'), 'r') as f:
+            speed = int(f.read())
+    except (OSError, ValueError):
+        return None
+    # Мбит/с; у Wi-Fi и отключенных интерфейсов -1
+    return speed * 125_000 if speed > 0 else None
+
+def counter_delta(current, previous, elapsed, max_rate=DEFAULT_MAX_RATE):
+    """Прирост счетчика с учетом переполнения и сброса интерфейса
+
+    Уменьшившийся счетчик - переполнение 32-битного счетчика, только если
+    такой прирост возможен за elapsed секунд на скорости не выше max_rate.
+    Иначе интерфейс был сброшен или пересоздан, и возвращается None.
+    """
+    if current >= previous:
+        return current - previous
+    if previous < COUNTER_WRAP_32:
+        wrapped = current + COUNTER_WRAP_32 - previous
+        if wrapped <= max_rate * elapsed:
+            return wrapped
+    # Счетчик начался заново: скорость считается от нового значения
+    return None
+
+def update_speeds(interface, counters, smoothing=2):
+    """Посчитать скорости по снимку предыдущего запуска и обновить снимок
+
+    Возвращает (download, upload) в байтах в секунду.
+    """
+    state_file = ping_status.get_cache_dir() / 'network-speed.json'
+    state = ping_status.read_json(state_file, {})
+    if not isinstance(state, dict):
+        state = {}
+
+    now = time.time()
+    current = counters.get(interface)
+    previous = state.get(interface)
+
+    if not current:
+        return 0, 0
+
+    if not isinstance(previous, dict):
+        # Первый запуск: скорость узнаем в следующий раз
+        state[interface] = {'timestamp': now, 'rx': current['rx'], 'tx': current['tx'],
+                            'rx_rate': 0, 'tx_rate': 0}
         try:
-            stats = psutil.net_io_counters(pernic=True)
-            if self.interface in stats:
-                self.last_download = stats[self.interface].bytes_recv
-                self.last_upload = stats[self.interface].bytes_sent
+            ping_status.write_json_atomic(state_file, state)
+        except OSError:
+            pass
+        return 0, 0
+
+    elapsed = now - previous.get('timestamp', 0)
+    rx_rate = previous.get('rx_rate', 0)
+    tx_rate = previous.get('tx_rate', 0)
+
+    if elapsed < MIN_SAMPLE_INTERVAL:
+        return rx_rate, tx_rate
+
+    max_rate = DEFAULT_MAX_RATE
+    if current['rx'] < previous.get('rx', 0) or current['tx'] < previous.get('tx', 0):
+        max_rate = get_link_rate(interface) or DEFAULT_MAX_RATE
+    rx_delta = counter_delta(current['rx'], previous.get('rx', 0), elapsed, max_rate)
+    tx_delta = counter_delta(current['tx'], previous.get('tx', 0), elapsed, max_rate)
+
+    if rx_delta is not None and tx_delta is not None:
+        # EWMA с учетом неравномерного интервала между запусками
+        alpha = 1 - math.exp(-elapsed / smoothing) if smoothing > 0 else 1
+        rx_rate += alpha * (rx_delta / elapsed - rx_rate)
+        tx_rate += alpha * (tx_delta / elapsed - tx_rate)
+
+    state[interface] = {'timestamp': now, 'rx': current['rx'], 'tx': current['tx'],
+                        'rx_rate': rx_rate, 'tx_rate': tx_rate}
+    try:
+        ping_status.write_json_atomic(state_file, state)
+    except OSError:
+        pass
+
+    return rx_rate, tx_rate
+
+def format_speed(speed_bytes, units="mbps", show_icons=True, icon="↓"):
+    """Форматировать скорость в читаемый вид"""
+    try:
+        if units == "mbps":
+            speed = (speed_bytes * 8) / 1_000_000  # Мбит/с
+            unit_str = "Mbps"
+        elif units == "kbps":
+            speed = (speed_bytes * 8) / 1_000  # Кбит/с
+            unit_str = "Kbps"
+        elif units == "B/s":
+            speed = speed_bytes  # Байт/с
+            if speed >= 1_000_000:
+                speed = speed / 1_000_000
+                unit_str = "MB/s"
+            elif speed >= 1_000:
+                speed = speed / 1_000
+                unit_str = "KB/s"
             else:
-                # Если интерфейс не найден, используем общую статистику
-                total_stats = psutil.net_io_counters()
-                self.last_download = total_stats.bytes_recv
-                self.last_upload = total_stats.bytes_sent
-        except:
-            self.last_download = 0
-            self.last_upload = 0
-            
-        self.last_time = time.time()
-        
-        while self.running:
-            try:
-                current_time = time.time()
-                time_diff = current_time - self.last_time
-                
-                if time_diff > 0:
-                    # Получаем текущую статистику
-                    try:
-                        stats = psutil.net_io_counters(pernic=True)
-                        if self.interface in stats and self.interface != "unknown":
-                            current_download = stats[self.interface].bytes_recv
-                            current_upload = stats[self.interface].bytes_sent
-                        else:
-                            # Fallback на общую статистику
-                            total_stats = psutil.net_io_counters()
-                            current_download = total_stats.bytes_recv
-                            current_upload = total_stats.bytes_sent
-                    except:
-                        current_download = 0
-                        current_upload = 0
-                    
-                    # Вычисляем скорость
-                    download_diff = current_download - self.last_download
-                    upload_diff = current_upload - self.last_upload
-                    
-                    self.download_speed = download_diff / time_diff
-                    self.upload_speed = upload_diff / time_diff
-                    
-                    # Обновляем общий трафик
-                    self.total_download += download_diff
-                    self.total_upload += upload_diff
-                    
-                    # Сохраняем текущие значения для следующего измерения
-                    self.last_download = current_download
-                    self.last_upload = current_upload
-                    self.last_time = current_time
-                
-                time.sleep(interval)
-                
-            except Exception as e:
-                # В случае ошибки продолжаем работу
-                time.sleep(interval)
-    
-    def format_speed(self, speed_bytes, units="mbps", show_icons=True):
-        """Форматировать скорость в читаемый вид"""
-        try:
-            if units == "mbps":
-                speed = (speed_bytes * 8) / 1_000_000  # Мбит/с
+                unit_str = "B/s"
+        else:
+            # Автоматический выбор единиц
+            if speed_bytes > 1_000_000:  # > 1 MB/s
+                speed = (speed_bytes * 8) / 1_000_000
                 unit_str = "Mbps"
-            elif units == "kbps":
-                speed = (speed_bytes * 8) / 1_000  # Кбит/с
+            elif speed_bytes > 1_000:  # > 1 KB/s
+                speed = (speed_bytes * 8) / 1_000
                 unit_str = "Kbps"
-            elif units == "B/s":
-                speed = speed_bytes  # Байт/с
-                if speed >= 1_000_000:
-                    speed = speed / 1_000_000
-                    unit_str = "MB/s"
-                elif speed >= 1_000:
-                    speed = speed / 1_000
-                    unit_str = "KB/s"
-                else:
-                    unit_str = "B/s"
-            else:
-                # Автоматический выбор единиц
-                if speed_bytes > 1_000_000:  # > 1 MB/s
-                    speed = (speed_bytes * 8) / 1_000_000
-                    unit_str = "Mbps"
-                elif speed_bytes > 1_000:  # > 1 KB/s
-                    speed = (speed_bytes * 8) / 1_000
-                    unit_str = "Kbps"
-                else:
-                    speed = speed_bytes
-                    unit_str = "B/s"
-            
-            icon = "↓" if "download" in inspect.stack()[1].function else "↑"
-            
-            if show_icons:
-                return f"{icon} {speed:.1f} {unit_str}"
             else:
-                return f"{speed:.1f} {unit_str}"
-                
-        except:
-            return "N/A"
-    
-    def format_usage(self):
-        """Форматировать общее использование сети"""
-        try:
-            if self.total_download >= 1_000_000_000:  # GB
-                download_usage = self.total_download / 1_000_000_000
-                upload_usage = self.total_upload / 1_000_000_000
-                return f"↓{download_usage:.1f}GB ↑{upload_usage:.1f}GB"
-            elif self.total_download >= 1_000_000:  # MB
-                download_usage = self.total_download / 1_000_000
-                upload_usage = self.total_upload / 1_000_000
-                return f"↓{download_usage:.1f}MB ↑{upload_usage:.1f}MB"
-            else:  # KB
-                download_usage = self.total_download / 1_000
-                upload_usage = self.total_upload / 1_000
-                return f"↓{download_usage:.1f}KB ↑{upload_usage:.1f}KB"
-        except:
-            return "Usage: N/A"
-
-# Глобальный монитор
-monitor = NetworkSpeedMonitor()
+                speed = speed_bytes
+                unit_str = "B/s"
+
+        if show_icons:
+            return f"{icon} {speed:.1f} {unit_str}"
+        else:
+            return f"{speed:.1f} {unit_str}"
+
+    except Exception:
+        return "N/A"
+
+def format_usage(total_download, total_upload):
+    """Форматировать общее использование сети"""
+    if total_download >= 1_000_000_000:  # GB
+        return f"↓{total_download / 1_000_000_000:.1f}GB ↑{total_upload / 1_000_000_000:.1f}GB"
+    elif total_download >= 1_000_000:  # MB
+        return f"↓{total_download / 1_000_000:.1f}MB ↑{total_upload / 1_000_000:.1f}MB"
+    else:  # KB
+        return f"↓{total_download / 1_000:.1f}KB ↑{total_upload / 1_000:.1f}KB"
 
 def get_network_config():
     """Получить конфигурацию плагина"""
     from configparser import ConfigParser
-    import os
-    
+
     config_path = Path.home() / '.config' / 'ping-status.conf'
     if not config_path.exists():
         config_path = Path('/etc/ping-status.conf')
-    
+
     config = ConfigParser()
     config.read(config_path)
-    
+
     return {
-        'interval': config.getint('network-speed', 'interval', fallback=2),
+        'interval': config.getfloat('network-speed', 'interval', fallback=2),
         'units': config.get('network-speed', 'units', fallback='mbps'),
         'show_icons': config.getboolean('network-speed', 'show_icons', fallback=True),
         'interface': config.get('network-speed', 'interface', fallback='auto')
@@ -226,51 +229,33 @@ def get_network_config():
 
 def register():
     """Функция регистрации плагина"""
-    import inspect
-    
     config = get_network_config()
-    
-    # Запускаем мониторинг если еще не запущен
-    if not monitor.running:
-        monitor.start_monitoring(config['interval'])
-    
-    # Даем немного времени для сбора данных при первом запуске
-    if monitor.last_time == time.time():
-        time.sleep(0.5)
-    
+
     try:
+        counters = read_net_counters()
+        interface = get_active_interface(counters, config['interface'])
+        download_speed, upload_speed = update_speeds(interface, counters, config['interval'])
+
         # Форматируем скорости
-        download_str = monitor.format_speed(
-            monitor.download_speed, 
-            config['units'], 
-            config['show_icons']
-        )
-        
-        upload_str = monitor.format_speed(
-            monitor.upload_speed, 
-            config['units'], 
-            config['show_icons']
-        )
-        
-        usage_str = monitor.format_usage()
-        
+        download_str = format_speed(download_speed, config['units'], config['show_icons'], "↓")
+        upload_str = format_speed(upload_speed, config['units'], config['show_icons'], "↑")
+
+        totals = counters.get(interface, {'rx': 0, 'tx': 0})
+        usage_str = format_usage(totals['rx'], totals['tx'])
+
         return {
             'net_speed': f"{download_str} {upload_str}",
             'download_speed': download_str,
             'upload_speed': upload_str,
             'network_usage': usage_str,
-            'network_interface': monitor.interface
+            'network_interface': interface
         }
-        
+
     except Exception as e:
         return {
             'net_speed': "Network: N/A",
             'download_speed': "↓ N/A",
-            'upload_speed': "↑ N/A", 
+            'upload_speed': "↑ N/A",
             'network_usage': "Usage: N/A",
             'network_interface': "unknown"
         }
-
-# Останавливаем мониторинг при завершении работы
-import atexit
-atexit.register(monitor.stop_monitoring)
\ No newline at end of file
@@ -3,8 +3,13 @@
 import subprocess
 import os
 import re
-__min_version__ = "3.3.0"
-__version__ = "1.1.1"
+import glob
+import shutil
+import ping_status
+__min_version__ = "3.4.0"
+__provides__ = ["system_info", "cpu_usage", "cpu_temp", "cpu_load", "memory", "disk", "swap", "os", "kernel", "gpu"]
+__cost__ = "io"
+__version__ = "1.5.2"
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/system-info.plugin.py"
 __name__ = "system-info"
 
@@ -28,57 +33,90 @@ Available Placeholders:
 
 Configuration:
 No configuration required. Plugin automatically detects system metrics.
+OS, kernel, GPU and the CPU temperature sensor are detected once per boot.
 
 Icons Used:
  - CPU |  - Temperature |  - RAM |  - Disk |  - OS
 """
 
 def get_cpu_usage():
-    """Получить загрузку CPU"""
-    try:
-        with open('/proc/stat', 'r') as f:
-            lines = f.readlines()
-        for line in lines:
-            if line.startswith('cpu '):
-                values = line.split()
-                total = sum(int(x) for x in values[1:])
-                idle = int(values[4])
-                usage = 100 - (idle * 100 / total)
-                return f"{usage:.1f}%"
-    except:
+    """Получить загрузку CPU (общий сэмплер ядра)"""
+    usage = ping_status.get_cpu_usage()['total']
+    if usage is None:
         return "unknown"
+    return f"{usage:.1f}%"
+
+# hwmon-драйверы датчиков CPU в порядке предпочтения
+CPU_HWMON_NAMES = ['coretemp', 'k10temp', 'zenpower', 'cpu_thermal', 'soc_thermal', 'acpitz']
+
+# Типы thermal zone, относящиеся к CPU
+CPU_THERMAL_ZONE_TYPES = ['x86_pkg_temp', 'cpu-thermal', 'cpu_thermal', 'soc_thermal', 'soc-thermal', 'acpitz']
+
+def read_text(path):
+    """Прочитать короткий файл sysfs"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def find_cpu_temperature_sensor():
+    """Найти файл датчика температуры CPU (полный обход hwmon и thermal zone)"""
+    # hwmon: у coretemp/k10temp выбираем пакетный датчик по метке
+    hwmons = {}
+    for hwmon in sorted(glob.glob(ping_status.sys_path('/sys/class/hwmon/hwmon*'))):
+        name = read_text(os.path.join(hwmon, 'name'))
+        if name in CPU_HWMON_NAMES and name not in hwmons:
+            hwmons[name] = hwmon
+
+    for name in CPU_HWMON_NAMES:
+        hwmon = hwmons.get(name)
+        if not hwmon:
+            continue
+        inputs = sorted(glob.glob(os.path.join(hwmon, 'temp*_input')))
+        for temp_input in inputs:
+            label = read_text(temp_input.replace('_input', '_label')) or ''
+            if label.startswith(('Package', 'Tdie', 'Tctl')):
+                return temp_input
+        if inputs:
+            return inputs[0]
+
+    # thermal zone по типу
+    zones = {}
+    for zone in sorted(glob.glob(ping_status.sys_path('/sys/class/thermal/thermal_zone*'))):
+        zone_type = read_text(os.path.join(zone, 'type'))
+        if zone_type in CPU_THERMAL_ZONE_TYPES and zone_type not in zones:
+            zones[zone_type] = os.path.join(zone, 'temp')
+
+    for zone_type in CPU_THERMAL_ZONE_TYPES:
+        if zone_type in zones:
+            return zones[zone_type]
+
+    # Запасной вариант: прежние фиксированные пути
+    for path in ['/sys/class/thermal/thermal_zone0/temp', '/sys/class/hwmon/hwmon0/temp1_input']:
+        path = ping_status.sys_path(path)
+        if os.path.exists(path):
+            return path
+    return None
 
 def get_cpu_temperature():
     """Получить температуру CPU"""
     try:
-        temp_paths = [
-            '/sys/class/thermal/thermal_zone0/temp',
-            '/sys/class/hwmon/hwmon0/temp1_input',
-            '/sys/class/hwmon/hwmon1/temp1_input',
-            '/sys/class/hwmon/hwmon2/temp1_input'
-        ]
-        
-        for path in temp_paths:
-            if os.path.exists(path):
-                with open(path, 'r') as f:
-                    temp = int(f.read().strip())
-                    return f"{temp / 1000:.1f}°C"
-        return "unknown"
+        path = ping_status.boot_fact('cpu_temp_sensor', find_cpu_temperature_sensor)
+        if not path:
+            return "unknown"
+        with open(path, 'r') as f:
+            temp = int(f.read().strip())
+        return f"{temp / 1000:.1f}°C"
     except:
         return "unknown"
 
 def get_memory_usage():
     """Получить использование памяти"""
     try:
-        with open('/proc/meminfo', 'r') as f:
-            lines = f.readlines()
-        meminfo = {}
-        for line in lines:
-            key, value = line.split(':', 1)
-            meminfo[key.strip()] = value.strip().split(' ')[0]
-        
-        total = int(meminfo['MemTotal'])
-        available = int(meminfo.get('MemAvailable', meminfo.get('MemFree', '0')))
+        meminfo = ping_status.snapshot().meminfo
+        total = meminfo['MemTotal']
+        available = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
         used = total - available
         usage_percent = (used / total) * 100
         return {
@@ -90,33 +128,22 @@ def get_memory_usage():
         return {'used_mb': 0, 'total_mb': 0, 'percent': 0}
 
 def get_disk_usage():
-    """Получить использование диска"""
-    try:
-        result = subprocess.run(['df', '/', '-h'], capture_output=True, text=True)
-        lines = result.stdout.split('\n')
-        if len(lines) > 1:
-            values = lines[1].split()
-            return {
-                'used': values[2],
-                'total': values[1],
-                'percent': values[4]
-            }
-        return {'used': '0', 'total': '0', 'percent': '0%'}
-    except:
+    """Получить использование диска (statvfs корня через ядро, без df)"""
+    disk = ping_status.get_disk_usage('/')
+    if not disk:
         return {'used': '0', 'total': '0', 'percent': '0%'}
+    return {
+        'used': disk['used_h'],
+        'total': disk['total_h'],
+        'percent': "stale" if disk['stale'] else f"{disk['percent']}%"
+    }
 
 def get_swap_usage():
     """Получить использование swap"""
     try:
-        with open('/proc/meminfo', 'r') as f:
-            lines = f.readlines()
-        meminfo = {}
-        for line in lines:
-            key, value = line.split(':', 1)
-            meminfo[key.strip()] = value.strip().split(' ')[0]
-        
-        swap_total = int(meminfo.get('SwapTotal', 0))
-        swap_free = int(meminfo.get('SwapFree', 0))
+        meminfo = ping_status.snapshot().meminfo
+        swap_total = meminfo.get('SwapTotal', 0)
+        swap_free = meminfo.get('SwapFree', 0)
         
         if swap_total > 0:
             swap_used = swap_total - swap_free
@@ -132,18 +159,22 @@ def get_swap_usage():
 
 def get_load_average():
     """Получить среднюю нагрузку системы"""
-    try:
-        with open('/proc/loadavg', 'r') as f:
-            loadavg = f.read().strip().split()
-        return f"{loadavg[0]}, {loadavg[1]}, {loadavg[2]}"
-    except:
+    loadavg = ping_status.snapshot().loadavg
+    if not loadavg:
         return "unknown"
+    return f"{loadavg[0]:.2f}, {loadavg[1]:.2f}, {loadavg[2]:.2f}"
 
 def get_os_info():
-    """Получить информацию об ОС"""
+    """Получить информацию об ОС (определяется раз за загрузку)"""
+    return ping_status.boot_fact('os', discover_os_info)
+
+def discover_os_info():
+    """Определить ОС по /etc/os-release"""
+    os_release = ping_status.sys_path('/etc/os-release')
+    issue = ping_status.sys_path('/etc/issue')
     try:
-        if os.path.exists('/etc/os-release'):
-            with open('/etc/os-release', 'r') as f:
+        if os.path.exists(os_release):
+            with open(os_release, 'r') as f:
                 lines = f.readlines()
             os_info = {}
             for line in lines:
@@ -164,8 +195,8 @@ def get_os_info():
             else:
                 return name.split()[0] if ' ' in name else name
                 
-        elif os.path.exists('/etc/issue'):
-            with open('/etc/issue', 'r') as f:
+        elif os.path.exists(issue):
+            with open(issue, 'r') as f:
                 return f.read().strip().replace('\\n', '').replace('\\l', '')[:15]
         else:
             return "Unknown"
@@ -175,13 +206,20 @@ def get_os_info():
 def get_kernel_version():
     """Получить версию ядра"""
     try:
-        result = subprocess.run(['uname', '-r'], capture_output=True, text=True)
-        return result.stdout.strip()
+        return ping_status.boot_fact('kernel', discover_kernel_version)
     except:
         return "unknown"
 
+def discover_kernel_version():
+    """Версия ядра из /proc/sys/kernel/osrelease (как uname -r)"""
+    return read_text(ping_status.sys_path('/proc/sys/kernel/osrelease')) or os.uname().release
+
 def get_gpu_info():
-    """Получить информацию о GPU"""
+    """Получить информацию о GPU (определяется раз за загрузку)"""
+    return ping_status.boot_fact('gpu', discover_gpu_info)
+
+def discover_gpu_info():
+    """Определить GPU через nvidia-smi или lspci"""
     try:
         # Попробуем получить информацию о GPU
         if shutil.which('nvidia-smi'):
@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 __plugin_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/termux-uptime.plugin.py"
 __name__ = "termux-uptime"
-__last_updated__ = "2025-11-24 1:17:00"
-__version__ = "1.0.0"
-__min_version__ = "3.3.0"
+__last_updated__ = "2026-10-19 12:00:00"
+__version__ = "1.1.4"
+__min_version__ = "3.4.0"
+__provides__ = ["tuptime", "tsession", "tbattery"]
+__per_shell__ = ["tsession"]
+__cost__ = "io"
 
 import os
+import json
 import time
 import subprocess
 from pathlib import Path
+import ping_status
 
 def get_help():
     return """
-Termux Uptime Plugin v1.0.0
+Termux Uptime Plugin v1.1.4
 ===========================
 
 Альтернативный способ получения времени работы системы для Termux.
@@ -26,164 +31,151 @@ Placeholders:
 - Работает в Termux без root прав
 - Использует альтернативные методы получения uptime
 - Показывает время сессии и батарею
+- Не запускает процессов при отрисовке: dumpsys/termux-battery-status
+  выполняются в фоне раз в минуту
 """
 
 def get_termux_uptime():
     """Получить время работы системы для Termux"""
+    snapshot = ping_status.snapshot()
+    
+    # Способ 1: /proc/uptime (доступен приложениям на всех версиях Android)
+    if snapshot.uptime is not None:
+        return format_uptime(snapshot.uptime)
+    
+    # Способ 2: время загрузки из /proc/stat
+    boot_timestamp = snapshot.stat.get('btime')
+    if boot_timestamp:
+        return format_uptime(time.time() - boot_timestamp)
+    
+    # Способ 3: Время с момента установки Termux (приблизительно)
     try:
-        # Способ 1: Через procfs (если доступно)
-        try:
-            with open('/proc/uptime', 'r') as f:
-                uptime_seconds = float(f.readline().split()[0])
-                return format_uptime(uptime_seconds)
-        except:
-            pass
-        
-        # Способ 2: Через системные свойства Android
-        try:
-            result = subprocess.run(['getprop', 'sys.boot_completed'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0 and '1' in result.stdout:
-                # Пытаемся получить время загрузки через dmesg
-                result = subprocess.run(['dmesg'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    for line in result.stdout.split('\n'):
-                        if 'BOOT_COMPLETED' in line or 'boot_complete' in line:
-                            # Парсим время из dmesg
-                            import re
-                            time_match = re.search(r'\[\s*(\d+\.\d+)\]', line)
-                            if time_match:
-                                boot_time = float(time_match.group(1))
-                                current_time = time.time()
-                                uptime_seconds = current_time - boot_time
-                                return format_uptime(uptime_seconds)
-        except:
-            pass
-        
-        # Способ 3: Через статистику системы
-        try:
-            result = subprocess.run(['cat', '/proc/stat'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith('btime'):
-                        boot_timestamp = int(line.split()[1])
-                        current_timestamp = time.time()
-                        uptime_seconds = current_timestamp - boot_timestamp
-                        return format_uptime(uptime_seconds)
-        except:
-            pass
-        
-        # Способ 4: Время с момента установки Termux (приблизительно)
-        try:
-            termux_dir = Path('/data/data/com.termux/files/home')
-            if termux_dir.exists():
-                install_time = termux_dir.stat().st_mtime
-                current_time = time.time()
-                uptime_seconds = current_time - install_time
-                return f"~{format_uptime(uptime_seconds)}"
-        except:
-            pass
-        
-        return "unknown"
-        
-    except Exception as e:
-        return f"error: {str(e)}"
+        termux_dir = Path('/data/data/com.termux/files/home')
+        if termux_dir.exists():
+            install_time = termux_dir.stat().st_mtime
+            return f"~{format_uptime(time.time() - install_time)}"
+    except OSError:
+        pass
+    
+    return "unknown"
+
+def get_process_start(pid):
+    """Время запуска процесса (unix time) по /proc/<pid>/stat и btime"""
+    with open(ping_status.sys_path(f'/proc/{pid}/stat'), 'r') as f:
+        stat_data = f.read()
+    # Имя процесса в скобках может содержать пробелы: поля считаем после ')'
+    fields = stat_data[stat_data.rindex(')') + 2:].split()
+    # Время начала процесса в clock ticks (22-е поле)
+    start_time_ticks = int(fields[19])
+    clock_ticks = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
+    boot_time = ping_status.snapshot().stat.get('btime')
+    if not boot_time:
+        uptime = ping_status.snapshot().uptime
+        if uptime is None:
+            raise OSError("boot time unavailable")
+        boot_time = time.time() - uptime
+    return boot_time + start_time_ticks / clock_ticks
 
 def get_termux_session():
-    """Получить время текущей сессии Termux"""
+    """Получить время текущей сессии Termux
+
+    Время запуска shell читается из /proc/<pid>/stat при каждой отрисовке:
+    PID переиспользуются, поэтому запомненное по PID время могло бы
+    достаться новой оболочке от старой.
+    """
+    # Оболочка: родитель ping-status или оболочка, передавшая фоновое обновление
+    pid = ping_status.get_shell_pid()
     try:
-        # Время с момента запуска shell процесса
-        pid = os.getppid()  # Родительский процесс (shell)
+        start_time = get_process_start(pid)
+    except (OSError, ValueError, IndexError):
+        # Альтернативный способ: время доступа к домашней директории
         try:
-            # Читаем время начала процесса из /proc
-            with open(f'/proc/{pid}/stat', 'r') as f:
-                stat_data = f.read().split()
-                # Время начала процесса в clock ticks
-                start_time_ticks = int(stat_data[21])
-                # Получаем clock ticks per second
-                clock_ticks = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
-                # Получаем время загрузки системы
-                with open('/proc/stat', 'r') as stat_file:
-                    for line in stat_file:
-                        if line.startswith('btime'):
-                            boot_time = int(line.split()[1])
-                            break
-                # Вычисляем время начала процесса
-                start_time = boot_time + (start_time_ticks / clock_ticks)
-                current_time = time.time()
-                session_seconds = current_time - start_time
-                return format_uptime(session_seconds)
-        except:
-            # Альтернативный способ: время создания домашней директории сессии
-            home_dir = Path.home()
-            session_start = home_dir.stat().st_atime
-            current_time = time.time()
-            session_seconds = current_time - session_start
-            return f"~{format_uptime(session_seconds)}"
-            
-    except Exception as e:
-        return "unknown"
+            session_start = Path.home().stat().st_atime
+            return f"~{format_uptime(time.time() - session_start)}"
+        except OSError:
+            return "unknown"
+    
+    return format_uptime(max(0, time.time() - start_time))
 
-def get_battery_info():
-    """Получить информацию о батарее Android"""
+# Как часто обновлять данные батареи через termux-battery-status/dumpsys (секунды)
+BATTERY_TTL = 60
+
+# Коды статуса из dumpsys battery (BatteryManager.BATTERY_STATUS_*)
+DUMPSYS_STATUS = {
+    '2': 'charging',
+    '3': 'discharging',
+    '4': 'not charging',
+    '5': 'full'
+}
+
+def read_sysfs_battery():
+    """Батарея из /sys/class/power_supply/battery/uevent (если доступна)"""
+    try:
+        with open(ping_status.sys_path('/sys/class/power_supply/battery/uevent'), 'r') as f:
+            content = f.read()
+    except OSError:
+        return None
+    values = {}
+    for line in content.splitlines():
+        key, _, value = line.partition('=')
+        values[key] = value.strip()
+    if 'POWER_SUPPLY_CAPACITY' not in values:
+        return None
+    return {
+        'level': values['POWER_SUPPLY_CAPACITY'],
+        'status': values.get('POWER_SUPPLY_STATUS', 'unknown').lower()
+    }
+
+def fetch_battery_status():
+    """Батарея через termux-battery-status или dumpsys (медленно, в фоне)"""
+    # Способ 1: Termux:API
     try:
-        # Способ 1: Через системные свойства
-        result = subprocess.run(['dumpsys', 'battery'], capture_output=True, text=True, timeout=5)
+        result = subprocess.run(['termux-battery-status'], capture_output=True, text=True, timeout=5)
         if result.returncode == 0:
-            battery_info = {}
-            for line in result.stdout.split('\n'):
-                if 'level' in line.lower():
-                    battery_info['level'] = line.split(':')[1].strip()
-                elif 'scale' in line.lower():
-                    battery_info['scale'] = line.split(':')[1].strip()
-                elif 'status' in line.lower() or 'charging' in line.lower():
-                    battery_info['status'] = line.split(':')[1].strip()
-            
-            if 'level' in battery_info:
-                level = battery_info['level']
-                status = battery_info.get('status', '')
-                
-                # Определяем иконку статуса
-                if 'charging' in status.lower() or 'ac' in status.lower():
-                    icon = '🔌'
-                elif 'full' in status.lower():
-                    icon = '✅'
-                else:
-                    icon = '🔋'
-                
-                return f"{icon} {level}%"
-        
-        # Способ 2: Через файловую систему
-        try:
-            battery_path = Path('/sys/class/power_supply/battery/')
-            if battery_path.exists():
-                capacity_file = battery_path / 'capacity'
-                status_file = battery_path / 'status'
-                
-                if capacity_file.exists():
-                    with open(capacity_file, 'r') as f:
-                        level = f.read().strip()
-                    
-                    status = "unknown"
-                    if status_file.exists():
-                        with open(status_file, 'r') as f:
-                            status = f.read().strip().lower()
-                    
-                    if 'charging' in status:
-                        icon = '🔌'
-                    elif 'full' in status:
-                        icon = '✅'
-                    else:
-                        icon = '🔋'
-                    
-                    return f"{icon} {level}%"
-        except:
-            pass
-            
+            data = json.loads(result.stdout)
+            return {
+                'level': str(data['percentage']),
+                'status': data.get('status', 'unknown').lower().replace('_', ' ')
+            }
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError):
+        pass
+    
+    # Способ 2: системный сервис Android
+    result = subprocess.run(['dumpsys', 'battery'], capture_output=True, text=True, timeout=5)
+    values = {}
+    for line in result.stdout.split('\n'):
+        key, _, value = line.partition(':')
+        values[key.strip().lower()] = value.strip()
+    if result.returncode != 0 or 'level' not in values:
+        raise RuntimeError("dumpsys battery unavailable")
+    
+    status = DUMPSYS_STATUS.get(values.get('status'), 'unknown')
+    if status == 'unknown' and any(values.get(f'{source} powered') == 'true'
+                                   for source in ('ac', 'usb', 'wireless')):
+        status = 'charging'
+    return {'level': values['level'], 'status': status}
+
+def get_battery_info():
+    """Получить информацию о батарее Android"""
+    battery = read_sysfs_battery()
+    stale = False
+    if battery is None:
+        # Команды работают сотни миллисекунд: берем результат из кеша
+        battery, stale = ping_status.swr_get('termux-battery', fetch_battery_status,
+                                             BATTERY_TTL, default=None)
+    if not battery:
         return "🔋 N/A"
-        
-    except Exception as e:
-        return "🔋 error"
+    
+    status = battery['status']
+    # Определяем иконку статуса
+    if status == 'charging':
+        icon = '🔌'
+    elif status == 'full':
+        icon = '✅'
+    else:
+        icon = '🔋'
+    
+    return ping_status.mark_stale(f"{icon} {battery['level']}%", stale)
 
 def format_uptime(seconds):
     """Форматировать время в читаемый вид"""
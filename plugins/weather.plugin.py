@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
-import urllib.request
 import json
+import time
+import hashlib
 import configparser
 from pathlib import Path
-__min_version__ = "3.3.0"
-__version__ = "1.1.0"
+import ping_status
+__min_version__ = "3.4.0"
+__provides__ = ["weather", "weather_short"]
+__cost__ = "network"
+__version__ = "1.3.1"
 __plugins_url__ = "https://raw.githubusercontent.com/hairpin01/ping-status/refs/heads/main/plugins/weather.plugin.py"
 __name__ = "weather"
 def get_help():
@@ -27,6 +31,13 @@ api_key = YOUR_API_KEY_HERE   # Get free API key from https://openweathermap.org
 city = Moscow                 # Your city name
 units = metric                # Temperature units: metric, imperial
 lang = en                     # Language code: en, ru, etc.
+ttl = 600                     # Forecast refresh interval, seconds
+geo_ttl = 21600               # IP geolocation cache lifetime, seconds
+
+Погода запрашивается в фоне: вывод берется из кеша и обновляется раз в
+ttl секунд, не задерживая отрисовку. Город по IP кешируется на geo_ttl
+и определяется заново при смене маршрута по умолчанию (другая сеть).
+Маркер устаревшего значения задается в [cache] stale_marker.
 
 Icons Used:
  - Weather section |  - Temperature |  - Wind |  - Humidity
@@ -47,67 +58,99 @@ def get_weather_config():
     api_key = config.get('weather', 'api_key', fallback='')
     units = config.get('weather', 'units', fallback='metric')
     lang = config.get('weather', 'lang', fallback='en')
+    ttl = config.getint('weather', 'ttl', fallback=600)
+    geo_ttl = config.getint('weather', 'geo_ttl', fallback=21600)
     
     return {
         'city': city,
         'api_key': api_key,
         'units': units,
-        'lang': lang
+        'lang': lang,
+        'ttl': ttl,
+        'geo_ttl': geo_ttl
     }
 
-def get_weather_by_ip():
-    """Получить погоду по IP (геолокация)"""
+def get_route_signature():
+    """Подпись сети: интерфейс и шлюз маршрута по умолчанию"""
+    route = ping_status.get_default_route()
+    if not route:
+        return None
+    return f"{route['interface']}/{route['gateway']}"
+
+def get_location_cache_file():
+    return ping_status.get_cache_dir() / 'weather-location.json'
+
+def read_cached_location():
+    """Сохраненная геолокация или None"""
+    entry = ping_status.read_json(get_location_cache_file())
+    return entry if isinstance(entry, dict) and entry.get('city') else None
+
+def get_location(geo_ttl=21600):
+    """Город по IP: ip-api.com опрашивается не чаще раза в geo_ttl секунд
+
+    Сохраненный город сбрасывается раньше, если сменился маршрут по
+    умолчанию: публичный IP меняется вместе с сетью.
+    """
+    route = get_route_signature()
+    cached = read_cached_location()
+    if (cached and cached.get('route') == route and
+            0 <= time.time() - cached.get('timestamp', 0) < geo_ttl):
+        return cached['city']
+    
+    location_data = json.loads(ping_status.http_get('http://ip-api.com/json/', timeout=5).decode('utf-8'))
+    city = location_data.get('city') or 'Moscow'
     try:
-        # Получить примерную локацию по IP
-        location_response = urllib.request.urlopen('http://ip-api.com/json/', timeout=5)
-        location_data = json.loads(location_response.read().decode('utf-8'))
-        
-        city = location_data.get('city', 'Moscow')
-        country = location_data.get('countryCode', 'RU')
-        
-        # Используем wttr.in как fallback
-        weather_response = urllib.request.urlopen(f'http://wttr.in/{city}?format=j1', timeout=5)
-        weather_data = json.loads(weather_response.read().decode('utf-8'))
-        
-        current = weather_data['current_condition'][0]
-        temp_c = current['temp_C']
-        desc = current['weatherDesc'][0]['value']
-        humidity = current['humidity']
-        wind_speed = current['windspeedKmph']
-        
-        # Подбор эмодзи по описанию погоды
-        weather_icon = get_weather_nerd_icon(desc)
-        
-        return f"{weather_icon} {temp_c}°C, {desc},  {humidity}%,  {wind_speed}km/h"
-        
-    except Exception as e:
-        return f" Weather unavailable"
+        ping_status.write_json_atomic(get_location_cache_file(), {
+            'timestamp': time.time(),
+            'route': route,
+            'city': city,
+            'country': location_data.get('countryCode')
+        })
+    except OSError:
+        pass
+    return city
+
+def get_weather_by_ip():
+    """Получить погоду по IP (геолокация)
+
+    Ошибки сети пробрасываются: swr_get оставит в кеше прошлую погоду.
+    """
+    config = get_weather_config()
+    city = get_location(config['geo_ttl'])
+    
+    # Используем wttr.in как fallback
+    weather_data = json.loads(ping_status.http_get(f'http://wttr.in/{city}?format=j1', timeout=5).decode('utf-8'))
+    
+    current = weather_data['current_condition'][0]
+    temp_c = current['temp_C']
+    desc = current['weatherDesc'][0]['value']
+    humidity = current['humidity']
+    wind_speed = current['windspeedKmph']
+    
+    # Подбор эмодзи по описанию погоды
+    weather_icon = get_weather_nerd_icon(desc)
+    
+    return f"{weather_icon} {temp_c}°C, {desc},  {humidity}%,  {wind_speed}km/h"
 
 def get_weather_openweather():
     """Получить погоду через OpenWeatherMap API"""
     config = get_weather_config()
     
     if not config['api_key']:
-        return " Configure API key"
+        return " Configure API key"
     
-    try:
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={config['city']}&appid={config['api_key']}&units={config['units']}&lang={config['lang']}"
-        
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode('utf-8'))
-        
-        temp = data['main']['temp']
-        feels_like = data['main']['feels_like']
-        humidity = data['main']['humidity']
-        description = data['weather'][0]['description']
-        wind_speed = data['wind']['speed']
-        
-        weather_icon = get_weather_nerd_icon(description)
-        
-        return f"{weather_icon} {temp:.1f}°C (feels {feels_like:.1f}°C), {description},  {humidity}%,  {wind_speed}m/s"
-        
-    except Exception as e:
-        return f" API error"
+    url = f"http://api.openweathermap.org/data/2.5/weather?q={config['city']}&appid={config['api_key']}&units={config['units']}&lang={config['lang']}"
+    data = json.loads(ping_status.http_get(url, timeout=10).decode('utf-8'))
+    
+    temp = data['main']['temp']
+    feels_like = data['main']['feels_like']
+    humidity = data['main']['humidity']
+    description = data['weather'][0]['description']
+    wind_speed = data['wind']['speed']
+    
+    weather_icon = get_weather_nerd_icon(description)
+    
+    return f"{weather_icon} {temp:.1f}°C (feels {feels_like:.1f}°C), {description},  {humidity}%,  {wind_speed}m/s"
 
 def get_weather_nerd_icon(description):
     """Получить Nerd Font иконку для погоды по описанию"""
@@ -143,9 +186,39 @@ def get_weather():
         # Иначе используем метод по IP
         return get_weather_by_ip()
 
+def get_weather_cache_key(config):
+    """Ключ кеша зависит от настроек, чтобы смена города сбрасывала кеш"""
+    settings = {key: config[key] for key in ('city', 'api_key', 'units', 'lang')}
+    digest = hashlib.md5(repr(sorted(settings.items())).encode('utf-8')).hexdigest()[:12]
+    return f"weather-{digest}"
+
 def register():
-    """Функция регистрации плагина"""
-    weather_data = get_weather()
+    """Функция регистрации плагина
+
+    Только чтение кеша: прогноз и геолокация обновляются в фоне.
+    """
+    config = get_weather_config()
+    key = get_weather_cache_key(config)
+    weather_data, stale = ping_status.swr_get(
+        key, get_weather, config['ttl'], default=" Weather loading…"
+    )
+    
+    if not config['api_key']:
+        # Сменилась сеть: прогноз для прежнего города устарел
+        location = read_cached_location()
+        route = get_route_signature()
+        if location and location.get('route') != route:
+            # Город устарел: фоновое обновление определит его заново,
+            # а запись с новым маршрутом не даст запускать его на каждой отрисовке
+            location.update({'route': route, 'timestamp': 0})
+            try:
+                ping_status.write_json_atomic(get_location_cache_file(), location)
+            except OSError:
+                pass
+            ping_status.refresh_in_background(key, get_weather)
+            stale = True
+    
+    weather_data = ping_status.mark_stale(weather_data, stale)
     return {
         'weather': weather_data,
         'weather_short': f" {weather_data[:25]}..." if len(weather_data) > 25 else f" {weather_data}"